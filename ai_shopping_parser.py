@@ -3,13 +3,19 @@ AI-powered shopping list parsing using Google Gemini API
 Extracts grocery items from email receipts and shopping lists
 """
 import google.generativeai as genai
-from typing import List, Dict, Optional
-from pydantic import BaseModel
+from typing import List, Dict, Optional, Tuple
+from pydantic import BaseModel, TypeAdapter, ValidationError
+import asyncio
 import json
 import re
 from decouple import config
 import logging
 
+try:
+    import orjson as _json  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    _json = json
+
 # Configure Gemini AI
 GEMINI_API_KEY = config('GEMINI_API_KEY', default=None)
 if GEMINI_API_KEY:
@@ -17,6 +23,93 @@ if GEMINI_API_KEY:
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent Gemini requests issued by parse_many (respects API QPS)
+MAX_CONCURRENT_AI_REQUESTS = 8
+
+# Content budget per Gemini prompt
+MAX_PROMPT_CONTENT_CHARS = 2000
+
+# Common grocery item patterns - compiled once at import, reused on every parse
+_FOOD_KEYWORDS = (
+    'chicken', 'beef', 'pork', 'fish', 'salmon', 'bread', 'milk', 'eggs', 'cheese', 'yogurt',
+    'butter', 'apples', 'bananas', 'carrots', 'onions', 'potatoes', 'rice', 'pasta', 'cereal'
+)
+_FOOD_ALTERNATION = '|'.join(_FOOD_KEYWORDS)
+_FOOD_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        rf'(\d+\.?\d*)\s*(lbs?|pounds?|oz|ounces?|ct|count|each)?\s+([A-Za-z\s]+(?:{_FOOD_ALTERNATION}))',
+        rf'([A-Za-z\s]+(?:{_FOOD_ALTERNATION}))\s+(\d+\.?\d*)\s*(lbs?|pounds?|oz|ounces?|ct|count)?',
+    )
+]
+_JSON_DECODER = json.JSONDecoder()
+
+# Storage category keywords for _infer_category - one compiled scan per tier
+_FREEZER_KEYWORDS_RE = re.compile('|'.join(map(re.escape, (
+    'frozen', 'ice cream', 'chicken breast', 'ground beef',
+    'fish', 'salmon', 'shrimp', 'french fries', 'pizza'
+))), re.IGNORECASE)
+_FRIDGE_KEYWORDS_RE = re.compile('|'.join(map(re.escape, (
+    'milk', 'yogurt', 'cheese', 'eggs', 'butter', 'lettuce',
+    'carrots', 'fresh', 'produce', 'deli', 'meat'
+))), re.IGNORECASE)
+
+def _truncate_at_line(content: str, limit: int) -> str:
+    """Cut content to at most `limit` chars, backing up to the last full line so no item is split"""
+    if len(content) <= limit:
+        return content
+    cut = content.rfind('\n', 0, limit)
+    return content[:cut] if cut > 0 else content[:limit]
+
+_PROMPT_RULES = """
+RULES:
+1. Only extract actual food/grocery items (no services, fees, bags, etc.)
+2. Determine the best storage location: "freezer", "fridge", or "pantry"
+3. Extract quantity and unit when clear
+4. Provide confidence score 0.0-1.0 based on clarity
+5. Return ONLY valid JSON array, no other text
+
+OUTPUT FORMAT:
+[
+  {
+    "name": "Chicken Breast",
+    "quantity": 2.0,
+    "unit": "lbs", 
+    "category": "freezer",
+    "confidence": 0.95,
+    "raw_text": "Chicken Breast 2lb"
+  }
+]
+
+CONTENT TO PARSE:
+"""
+
+def _prompt_prefix(source_type: str) -> str:
+    return f"\nYou are a grocery shopping assistant. Parse this {source_type} content and extract food items.\n{_PROMPT_RULES}"
+
+# Source-specific guidance appended after the content
+_SOURCE_GUIDANCE = {
+    "hannaford": """
+HANNAFORD SPECIFIC:
+- Items often have store codes/SKUs - ignore these
+- Look for quantity patterns like "2 @ $3.99"
+- Fresh items go to fridge, frozen to freezer, shelf-stable to pantry
+""",
+    "instacart": """
+INSTACART SPECIFIC:
+- Items may have replacement notes - focus on actual item purchased
+- Quantities often in parentheses
+- Check for "Fresh", "Frozen" category indicators
+""",
+    "generic": "",
+    "unknown": "",
+}
+
+# source_type -> (prompt prefix, guidance), built once; only content is interpolated per call
+_SOURCE_PROMPTS = {
+    source_type: (_prompt_prefix(source_type), guidance)
+    for source_type, guidance in _SOURCE_GUIDANCE.items()
+}
+
 class ParsedItem(BaseModel):
     name: str
     quantity: Optional[float] = 1.0
@@ -25,6 +118,9 @@ class ParsedItem(BaseModel):
     confidence: float  # 0.0 - 1.0
     raw_text: str  # original text matched
 
+_ITEM_LIST_ADAPTER = TypeAdapter(List[ParsedItem])
+_CATEGORIES = frozenset(("freezer", "fridge", "pantry"))
+
 class ShoppingListParser:
     """Parse grocery shopping lists and receipts using AI"""
     
@@ -65,77 +161,77 @@ class ShoppingListParser:
             # Fallback to rule-based parsing
             return self._fallback_parse(content)
     
-    def _create_parsing_prompt(self, content: str, source_type: str) -> str:
-        """Create context-aware prompt for different shopping sources"""
+    async def parse_shopping_content_async(self, content: str, source_type: str = "unknown") -> List[ParsedItem]:
+        """Async variant of parse_shopping_content - awaits Gemini instead of blocking"""
+        if not self.model:
+            logger.error("Gemini API not configured")
+            return []
         
-        base_prompt = f"""
-You are a grocery shopping assistant. Parse this {source_type} content and extract food items.
-
-RULES:
-1. Only extract actual food/grocery items (no services, fees, bags, etc.)
-2. Determine the best storage location: "freezer", "fridge", or "pantry"
-3. Extract quantity and unit when clear
-4. Provide confidence score 0.0-1.0 based on clarity
-5. Return ONLY valid JSON array, no other text
-
-OUTPUT FORMAT:
-[
-  {{
-    "name": "Chicken Breast",
-    "quantity": 2.0,
-    "unit": "lbs", 
-    "category": "freezer",
-    "confidence": 0.95,
-    "raw_text": "Chicken Breast 2lb"
-  }}
-]
-
-CONTENT TO PARSE:
-{content[:2000]}
-"""
+        try:
+            prompt = self._create_parsing_prompt(content, source_type)
+            response = await self.model.generate_content_async(prompt)
+            items = self._parse_ai_response(response.text, content)
+            
+            logger.info(f"Parsed {len(items)} items from {source_type} content")
+            return items
+            
+        except Exception as e:
+            logger.error(f"AI parsing failed: {e}")
+            return self._fallback_parse(content)
+    
+    async def parse_many(self, docs: List[Tuple[str, str]]) -> List[List[ParsedItem]]:
+        """
+        Parse several documents concurrently
         
-        # Add source-specific guidance
-        if source_type == "hannaford":
-            base_prompt += """
-HANNAFORD SPECIFIC:
-- Items often have store codes/SKUs - ignore these
-- Look for quantity patterns like "2 @ $3.99"
-- Fresh items go to fridge, frozen to freezer, shelf-stable to pantry
-"""
-        elif source_type == "instacart":
-            base_prompt += """
-INSTACART SPECIFIC:
-- Items may have replacement notes - focus on actual item purchased
-- Quantities often in parentheses
-- Check for "Fresh", "Frozen" category indicators
-"""
+        Args:
+            docs: (content, source_type) pairs
+        
+        Returns one item list per document, in input order.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_AI_REQUESTS)
         
-        return base_prompt
+        async def parse_one(content: str, source_type: str) -> List[ParsedItem]:
+            async with semaphore:
+                return await self.parse_shopping_content_async(content, source_type)
+        
+        return await asyncio.gather(*[parse_one(content, source_type) for content, source_type in docs])
+    
+    def _create_parsing_prompt(self, content: str, source_type: str) -> str:
+        """Create context-aware prompt for different shopping sources"""
+        prefix, guidance = _SOURCE_PROMPTS.get(source_type) or (_prompt_prefix(source_type), "")
+        return f"{prefix}{_truncate_at_line(content, MAX_PROMPT_CONTENT_CHARS)}\n{guidance}"
     
     def _parse_ai_response(self, response_text: str, original_content: str) -> List[ParsedItem]:
         """Parse AI JSON response into ParsedItem objects"""
         try:
-            # Clean response - sometimes AI adds extra text
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
+            # Clean response - sometimes AI adds extra text. raw_decode parses from the
+            # first '[' and stops at the array's real end, ignoring any trailing prose
+            start = response_text.find('[')
+            if start < 0:
+                items_data = _json.loads(response_text)
             else:
-                json_str = response_text
+                try:
+                    # Fast path: the array is the rest of the response
+                    items_data = _json.loads(response_text[start:])
+                except json.JSONDecodeError:
+                    items_data, _ = _JSON_DECODER.raw_decode(response_text, start)
             
-            # Parse JSON
-            items_data = json.loads(json_str)
+            # Convert to ParsedItem objects - one pydantic-core pass for the whole list,
+            # per-item only when something in it is invalid
+            try:
+                items = _ITEM_LIST_ADAPTER.validate_python(items_data)
+            except ValidationError:
+                items = []
+                for item_data in items_data:
+                    try:
+                        items.append(ParsedItem(**item_data))
+                    except Exception as e:
+                        logger.warning(f"Skipping invalid item: {item_data}, error: {e}")
             
-            # Convert to ParsedItem objects
-            items = []
-            for item_data in items_data:
-                try:
-                    item = ParsedItem(**item_data)
-                    # Validate category
-                    if item.category not in ["freezer", "fridge", "pantry"]:
-                        item.category = self._infer_category(item.name)
-                    items.append(item)
-                except Exception as e:
-                    logger.warning(f"Skipping invalid item: {item_data}, error: {e}")
+            # Validate category
+            for item in items:
+                if item.category not in _CATEGORIES:
+                    item.category = self._infer_category(item.name)
             
             return items
             
@@ -148,15 +244,14 @@ INSTACART SPECIFIC:
         """Rule-based fallback parsing when AI fails"""
         items = []
         
-        # Common grocery item patterns
-        food_patterns = [
-            r'(\d+\.?\d*)\s*(lbs?|pounds?|oz|ounces?|ct|count|each)?\s+([A-Za-z\s]+(?:chicken|beef|pork|fish|salmon|bread|milk|eggs|cheese|yogurt|butter|apples|bananas|carrots|onions|potatoes|rice|pasta|cereal))',
-            r'([A-Za-z\s]+(?:chicken|beef|pork|fish|salmon|bread|milk|eggs|cheese|yogurt|butter|apples|bananas|carrots|onions|potatoes|rice|pasta|cereal))\s+(\d+\.?\d*)\s*(lbs?|pounds?|oz|ounces?|ct|count)?'
-        ]
+        # Cheap literal prescan - the capture patterns backtrack heavily, so skip
+        # them entirely when no food keyword appears anywhere in the content
+        content_lower = content.lower()
+        if not any(keyword in content_lower for keyword in _FOOD_KEYWORDS):
+            return items
         
-        for pattern in food_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
+        for pattern in _FOOD_PATTERNS:
+            for match in pattern.finditer(content):
                 groups = match.groups()
                 if len(groups) >= 2:
                     # Extract components
@@ -183,20 +278,11 @@ INSTACART SPECIFIC:
     
     def _infer_category(self, item_name: str) -> str:
         """Infer storage category from item name"""
-        name_lower = item_name.lower()
-        
-        # Freezer items
-        if any(word in name_lower for word in [
-            'frozen', 'ice cream', 'chicken breast', 'ground beef', 
-            'fish', 'salmon', 'shrimp', 'french fries', 'pizza'
-        ]):
+        # Freezer keywords take priority over fridge keywords
+        if _FREEZER_KEYWORDS_RE.search(item_name):
             return "freezer"
         
-        # Fridge items  
-        if any(word in name_lower for word in [
-            'milk', 'yogurt', 'cheese', 'eggs', 'butter', 'lettuce',
-            'carrots', 'fresh', 'produce', 'deli', 'meat'
-        ]):
+        if _FRIDGE_KEYWORDS_RE.search(item_name):
             return "fridge"
         
         # Default to pantry
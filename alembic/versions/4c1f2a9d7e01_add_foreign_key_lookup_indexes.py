@@ -0,0 +1,38 @@
+"""Add indexes on foreign key lookup columns
+
+Revision ID: 4c1f2a9d7e01
+Revises: 936ecb15a293
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1f2a9d7e01'
+down_revision: Union[str, None] = '936ecb15a293'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables are created by metadata.create_all on startup, which already builds
+# these for fresh databases - hence if_not_exists
+INDEXES = (
+    ('ix_household_members_user_household', 'household_members', ['user_id', 'household_id']),
+    ('ix_locations_household_id', 'locations', ['household_id']),
+    ('ix_items_location_id', 'items', ['location_id']),
+    ('ix_items_added_by_user_id', 'items', ['added_by_user_id']),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -1,5 +1,7 @@
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from jose import jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -21,6 +23,9 @@ if config('ENVIRONMENT', default='development').lower() == 'production':
     if len(SECRET_KEY) < 32:
         raise ValueError("JWT_SECRET_KEY must be at least 32 characters long for security")
 
+# Verified tokens remembered per worker; a busy frontend re-sends the same token on every request
+TOKEN_CACHE_SIZE = 4096
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
@@ -40,18 +45,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _decode_token(token: str) -> Tuple[Optional[str], Optional[int]]:
+    """(sub, exp) claims of a token whose signature checked out; raises JWTError otherwise"""
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return payload.get("sub"), payload.get("exp")
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+        email, expires_at = _decode_token(credentials.credentials)
+        # A cache hit skips jwt.decode's own expiry check, so repeat it on every use
+        if email is None or (expires_at is not None and expires_at <= time.time()):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         return email
-    except jwt.PyJWTError:
+    except jwt.JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
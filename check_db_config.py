@@ -9,8 +9,8 @@ This utility helps verify that your database configuration is correct
 for the current environment and provides helpful debugging information.
 """
 
+import json
 import sys
-from pprint import pprint
 
 try:
     from utils.database_config import (
@@ -33,9 +33,7 @@ def main():
     try:
         # Get basic info
         info = get_database_info()
-        print("📊 Current Configuration:")
-        pprint(info, width=60)
-        print()
+        sys.stdout.write(f"📊 Current Configuration:\n{json.dumps(info, indent=2, default=str)}\n\n")
         
         # Run validations
         print("✅ Running Validations...")
@@ -60,26 +58,27 @@ def main():
             else:
                 print("   ⚪ Test isolation validation skipped (not in test mode)")
         
-        # Environment-specific advice
+        # Environment-specific advice - buffered and written once
         env = get_current_environment()
-        print(f"\n💡 Environment-Specific Advice ({env}):")
+        advice = [f"\n💡 Environment-Specific Advice ({env}):"]
         
         if env == 'development':
             if info['database_type'] == 'sqlite':
-                print("   • Consider using PostgreSQL to match production")
-                print("   • Current SQLite setup is fine for development")
+                advice.append("   • Consider using PostgreSQL to match production")
+                advice.append("   • Current SQLite setup is fine for development")
             else:
-                print("   • Great! Using PostgreSQL matches production")
+                advice.append("   • Great! Using PostgreSQL matches production")
         
         elif env == 'test':
-            print("   • Using isolated test database - good!")
-            print("   • Make sure tests clean up after themselves")
+            advice.append("   • Using isolated test database - good!")
+            advice.append("   • Make sure tests clean up after themselves")
         
         elif env == 'production':
-            print("   • Production configuration validated ✓")
-            print("   • Using PostgreSQL as required")
+            advice.append("   • Production configuration validated ✓")
+            advice.append("   • Using PostgreSQL as required")
         
-        print("\n🎉 Database configuration check completed successfully!")
+        advice.append("\n🎉 Database configuration check completed successfully!")
+        sys.stdout.write("\n".join(advice) + "\n")
         return 0
         
     except Exception as e:
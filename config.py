@@ -51,4 +51,13 @@ def get_config(key: str, default=None, cast=None):
         return decouple_config(key, default=default)
 
 # Auto-load on module import for backwards compatibility
-load_environment()
\ No newline at end of file
+load_environment()
+
+# Shared state for multi-worker deployments (rate limits, AI parse cache).
+# Unset keeps everything in per-process memory.
+REDIS_URL = get_config('REDIS_URL', default='')
+RATE_LIMIT_STORAGE_URI = REDIS_URL or 'memory://'
+# Sliding window approximated from the current and previous fixed-window counters:
+# two integer keys per client instead of a list of every hit timestamp, so each
+# check is O(1) in Redis regardless of the limit size
+RATE_LIMIT_STRATEGY = 'sliding-window-counter'
@@ -3,37 +3,78 @@ This file contains shared fixtures for the freezer-backend tests.
 """
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from passlib.context import CryptContext
 
 from main import app, limiter
-from database import get_db
+from routes.auth import limiter as auth_limiter
+from routes.households import limiter as households_limiter
+from database import get_db, QUERY_CACHE_SIZE
+import auth
 import models
 from utils.test_data import create_test_user_data
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# One in-memory database shared by every connection (StaticPool) - no file I/O or fsync
+SQLALCHEMY_DATABASE_URL = "sqlite://"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+    query_cache_size=QUERY_CACHE_SIZE,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, join_transaction_mode="create_savepoint")
 
 
-@pytest.fixture(scope="function")
-def db_session(tmp_path):
+# pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN itself
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
     """
-    Creates a new database session for a test.
+    Use minimum-cost bcrypt for the test session; production rounds make every
+    register/login in a fixture pay ~100ms of hashing.
     """
-    db_path = tmp_path / "test.db"
-    SQLALCHEMY_DATABASE_URL = f"sqlite:///{db_path}"
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4))
+        yield
+
 
+@pytest.fixture(scope="session")
+def db_schema():
+    """
+    Creates the schema once for the whole test session.
+    """
     models.Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    yield
+    models.Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session(db_schema):
+    """
+    Creates a new database session for a test. Everything the test commits is
+    released into an outer transaction that is rolled back afterwards.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection)
     try:
         yield db
     finally:
         db.close()
-        models.Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -50,7 +91,9 @@ def client(db_session):
             db_session.close()
 
     app.dependency_overrides[get_db] = override_get_db
-    limiter.enabled = False
+    # Each router has its own Limiter; register's 3/minute would otherwise trip across tests
+    for route_limiter in (limiter, auth_limiter, households_limiter):
+        route_limiter.enabled = False
     yield TestClient(app)
     del app.dependency_overrides[get_db]
 
@@ -1,11 +1,15 @@
-from sqlalchemy.orm import Session, joinedload
-from fastapi import HTTPException, status
+from sqlalchemy import exists
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from fastapi import BackgroundTasks, HTTPException, status
+from typing import Optional
 import models, schemas, auth
 from models import household_members
+import asyncio
+import base64
 import secrets
-import string
 from datetime import datetime, timedelta
-from email_service import generate_verification_token, send_verification_email, send_password_reset_email, send_household_invitation
+from email_service import generate_verification_token, send_verification_email, send_password_reset_email, send_household_invitation, run_in_mail_executor
 
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
@@ -13,23 +17,42 @@ def get_user_by_email(db: Session, email: str):
 def get_user_by_id(db: Session, user_id: int):
     return db.query(models.User).filter(models.User.id == user_id).first()
 
-async def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = auth.get_password_hash(user.password)
-    verification_token = generate_verification_token()
-    
+def _is_duplicate_email(error: IntegrityError) -> bool:
+    """True when the violated constraint is the unique index on users.email"""
+    # SQLite: "UNIQUE constraint failed: users.email"; Postgres names the index
+    message = str(error.orig)
+    return "users.email" in message or "ix_users_email" in message
+
+def _insert_user(db: Session, user: schemas.UserCreate, verification_token: str):
     db_user = models.User(
         email=user.email,
-        hashed_password=hashed_password,
+        hashed_password=auth.get_password_hash(user.password),
         full_name=user.full_name,
         verification_token=verification_token
     )
     db.add(db_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        # users.email is UNIQUE - the INSERT itself is the duplicate check
+        db.rollback()
+        if not _is_duplicate_email(e):
+            raise
+        raise HTTPException(status_code=400, detail="Email already registered")
     db.refresh(db_user)
+    return db_user
+
+async def create_user(db: Session, user: schemas.UserCreate, background_tasks: Optional[BackgroundTasks] = None):
+    verification_token = generate_verification_token()
+    
+    # bcrypt and the INSERT both block - run them on a worker thread, not the event loop
+    db_user = await asyncio.to_thread(_insert_user, db, user, verification_token)
     
-    # Send verification email
-    from email_service import send_verification_email
-    send_verification_email(user.email, verification_token)
+    # Send verification email - after the response when called from a route
+    if background_tasks is not None:
+        background_tasks.add_task(run_in_mail_executor, send_verification_email, user.email, verification_token)
+    else:
+        await run_in_mail_executor(send_verification_email, user.email, verification_token)
     
     return db_user
 
@@ -49,7 +72,8 @@ def authenticate_user(db: Session, email: str, password: str):
     return {"access_token": access_token, "token_type": "bearer"}
 
 def generate_invite_code():
-    return ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(8))
+    # 5 random bytes base32-encode to exactly 8 chars from A-Z2-7, no padding
+    return base64.b32encode(secrets.token_bytes(5)).decode('ascii')
 
 def create_household(db: Session, household: schemas.HouseholdCreate, owner_id: int):
     invite_code = generate_invite_code()
@@ -60,13 +84,10 @@ def create_household(db: Session, household: schemas.HouseholdCreate, owner_id:
         owner_id=owner_id
     )
     db.add(db_household)
-    db.commit()
-    db.refresh(db_household)
     
-    # Add owner as member
-    owner = get_user_by_id(db, owner_id)
+    # Add owner as member - identity-map hit when the caller already loaded the user
+    owner = db.get(models.User, owner_id)
     db_household.members.append(owner)
-    db.commit()
     
     # Create default locations
     default_locations = [
@@ -75,34 +96,29 @@ def create_household(db: Session, household: schemas.HouseholdCreate, owner_id:
         {"name": "Pantry", "location_type": "pantry", "temperature_range": "room_temp", "icon": "🏠", "color": "#F5DEB3"}
     ]
     
-    for loc_data in default_locations:
-        db_location = models.Location(
-            name=loc_data["name"],
-            location_type=loc_data["location_type"],
-            temperature_range=loc_data["temperature_range"],
-            icon=loc_data["icon"],
-            color=loc_data["color"],
-            household_id=db_household.id
-        )
-        db.add(db_location)
+    # Linked through the relationship so household, membership and locations go out in one commit
+    db.add_all([models.Location(**loc_data, household=db_household) for loc_data in default_locations])
     
     db.commit()
     db.refresh(db_household)
     return db_household
 
 def get_user_households(db: Session, user_id: int):
-    user = get_user_by_id(db, user_id)
-    return user.household_memberships if user else []
+    # One JOIN through the association table rather than loading the user first
+    return db.query(models.Household)\
+        .join(household_members, models.Household.id == household_members.c.household_id)\
+        .filter(household_members.c.user_id == user_id)\
+        .all()
 
 def get_household_by_id(db: Session, household_id: int):
     return db.query(models.Household).filter(models.Household.id == household_id).first()
 
 def is_household_member(db: Session, household_id: int, user_id: int):
-    household = get_household_by_id(db, household_id)
-    if not household:
-        return False
-    user = get_user_by_id(db, user_id)
-    return user in household.members
+    # Single indexed EXISTS on the association table - no household/user/members loads
+    return db.query(exists().where(
+        household_members.c.household_id == household_id,
+        household_members.c.user_id == user_id
+    )).scalar()
 
 def create_location(db: Session, location: schemas.LocationCreate, household_id: int):
     db_location = models.Location(
@@ -120,6 +136,38 @@ def get_household_locations(db: Session, household_id: int):
 def get_location_by_id(db: Session, location_id: int):
     return db.query(models.Location).filter(models.Location.id == location_id).first()
 
+def get_location_if_member(db: Session, location_id: int, user_id: int):
+    # Location lookup and membership check in one JOIN - None if either fails
+    return db.query(models.Location).join(
+        household_members,
+        household_members.c.household_id == models.Location.household_id
+    ).filter(
+        models.Location.id == location_id,
+        household_members.c.user_id == user_id
+    ).first()
+
+def get_item_if_member(db: Session, item_id: int, user_id: int):
+    # Item, its location and the membership check in one JOIN - None if any fails
+    return db.query(models.Item, models.Location).join(
+        models.Location, models.Item.location_id == models.Location.id
+    ).join(
+        household_members,
+        household_members.c.household_id == models.Location.household_id
+    ).filter(
+        models.Item.id == item_id,
+        household_members.c.user_id == user_id
+    ).first()
+
+def get_household_if_member(db: Session, household_id: int, user_id: int):
+    # Household lookup and membership check in one JOIN - None if either fails
+    return db.query(models.Household).join(
+        household_members,
+        household_members.c.household_id == models.Household.id
+    ).filter(
+        models.Household.id == household_id,
+        household_members.c.user_id == user_id
+    ).first()
+
 def create_item(db: Session, item: schemas.ItemCreate, location_id: int, user_id: int = None):
     db_item = models.Item(
         **item.dict(),
@@ -147,20 +195,26 @@ def verify_email(db: Session, token: str):
     db.refresh(user)
     return user
 
-async def request_password_reset(db: Session, email: str):
+def _store_password_reset_token(db: Session, email: str, reset_token: str):
     user = get_user_by_email(db, email)
+    if user:
+        user.password_reset_token = reset_token
+        user.password_reset_expires = datetime.utcnow() + timedelta(hours=1)
+        db.commit()
+    return user
+
+async def request_password_reset(db: Session, email: str, background_tasks: Optional[BackgroundTasks] = None):
+    reset_token = generate_verification_token()
+    user = await asyncio.to_thread(_store_password_reset_token, db, email, reset_token)
     if not user:
         # Don't reveal that email doesn't exist
         return {"message": "If the email exists, a reset link has been sent"}
     
-    reset_token = generate_verification_token()
-    user.password_reset_token = reset_token
-    user.password_reset_expires = datetime.utcnow() + timedelta(hours=1)
-    db.commit()
-    
-    # Send password reset email
-    from email_service import send_password_reset_email
-    send_password_reset_email(user.email, reset_token, user.full_name or "User")
+    # Send password reset email - after the response when called from a route
+    if background_tasks is not None:
+        background_tasks.add_task(run_in_mail_executor, send_password_reset_email, user.email, reset_token, user.full_name or "User")
+    else:
+        await run_in_mail_executor(send_password_reset_email, user.email, reset_token, user.full_name or "User")
     
     return {"message": "Password reset email sent"}
 
@@ -181,7 +235,8 @@ def reset_password(db: Session, token: str, new_password: str):
     
     return {"message": "Password reset successfully"}
 
-async def invite_to_household(db: Session, household_id: int, email: str, inviter_id: int):
+def _check_invite(db: Session, household_id: int, email: str, inviter_id: int):
+    """Validate an invitation; returns (household, inviter display name)"""
     household = get_household_by_id(db, household_id)
     if not household:
         raise HTTPException(status_code=404, detail="Household not found")
@@ -196,10 +251,16 @@ async def invite_to_household(db: Session, household_id: int, email: str, invite
         raise HTTPException(status_code=400, detail="User is already a member of this household")
     
     inviter = get_user_by_id(db, inviter_id)
-    inviter_name = inviter.full_name or inviter.email
+    return household, inviter.full_name or inviter.email
+
+async def invite_to_household(db: Session, household_id: int, email: str, inviter_id: int, background_tasks: Optional[BackgroundTasks] = None):
+    household, inviter_name = await asyncio.to_thread(_check_invite, db, household_id, email, inviter_id)
     
-    # Send invitation email
-    await send_household_invitation(email, household.name, household.invite_code, inviter_name)
+    # Send invitation email - after the response when called from a route
+    if background_tasks is not None:
+        background_tasks.add_task(run_in_mail_executor, send_household_invitation, email, household.name, household.invite_code, inviter_name)
+    else:
+        await run_in_mail_executor(send_household_invitation, email, household.name, household.invite_code, inviter_name)
     
     return {"message": f"Invitation sent to {email}"}
 
@@ -208,10 +269,10 @@ def join_household(db: Session, invite_code: str, user_id: int):
     if not household:
         raise HTTPException(status_code=404, detail="Invalid invite code")
     
-    user = get_user_by_id(db, user_id)
     if is_household_member(db, household.id, user_id):
         raise HTTPException(status_code=400, detail="You are already a member of this household")
     
+    user = get_user_by_id(db, user_id)
     household.members.append(user)
     db.commit()
     db.refresh(household)
@@ -226,11 +287,13 @@ def leave_household(db: Session, household_id: int, user_id: int):
     if household.owner_id == user_id:
         raise HTTPException(status_code=400, detail="Household owner cannot leave household. Transfer ownership first or delete household.")
     
-    user = get_user_by_id(db, user_id)
-    if not is_household_member(db, household_id, user_id):
+    # Indexed delete of the association row - no user or members collection load
+    result = db.execute(household_members.delete().where(
+        household_members.c.household_id == household_id,
+        household_members.c.user_id == user_id
+    ))
+    if result.rowcount == 0:
         raise HTTPException(status_code=400, detail="You are not a member of this household")
-    
-    household.members.remove(user)
     db.commit()
     
     return {"message": f"Successfully left {household.name}"}
@@ -252,9 +315,8 @@ def delete_location(db: Session, location_id: int):
     if not db_location:
         raise HTTPException(status_code=404, detail="Location not found")
     
-    # Check if location has items
-    items = get_location_items(db, location_id)
-    if items:
+    # Check if location has items - EXISTS stops at the first row instead of loading them all
+    if db.query(exists().where(models.Item.location_id == location_id)).scalar():
         raise HTTPException(status_code=400, detail="Cannot delete location with items. Move items first.")
     
     db.delete(db_location)
@@ -264,21 +326,24 @@ def delete_location(db: Session, location_id: int):
 # Additional CRUD functions for item management
 def get_user_items(db: Session, user_id: int):
     """Get all items from user's households - optimized with joins"""
-    # Single optimized query using joins to eliminate N+1 query problem
-    items = db.query(models.Item)\
+    # Single optimized query using joins to eliminate N+1 query problem;
+    # household_id comes back in the projection rather than via item.location.household
+    rows = db.query(models.Item, models.Location.household_id)\
         .join(models.Location)\
-        .join(models.Household)\
-        .join(household_members, models.Household.id == household_members.c.household_id)\
+        .join(household_members, models.Location.household_id == household_members.c.household_id)\
         .options(
-            joinedload(models.Item.location).joinedload(models.Location.household),
+            # Populate item.location from the join above instead of joining it a second time
+            contains_eager(models.Item.location),
             joinedload(models.Item.added_by)
         )\
         .filter(household_members.c.user_id == user_id)\
         .all()
     
     # Add household_id to each item for convenience (backward compatibility)
-    for item in items:
-        item.household_id = item.location.household.id
+    items = []
+    for item, household_id in rows:
+        item.household_id = household_id
+        items.append(item)
         
     return items
 
@@ -288,7 +353,7 @@ def get_user_locations(db: Session, user_id: int):
     locations = db.query(models.Location)\
         .join(models.Household)\
         .join(household_members, models.Household.id == household_members.c.household_id)\
-        .options(joinedload(models.Location.household))\
+        .options(contains_eager(models.Location.household))\
         .filter(household_members.c.user_id == user_id)\
         .all()
         
@@ -333,8 +398,7 @@ def get_user_by_discord_id(db: Session, discord_id: str):
     """Get user by Discord ID"""
     return db.query(models.User).filter(models.User.discord_id == discord_id).first()
 
-async def create_discord_user(db: Session, user_data: schemas.DiscordUserCreate):
-    """Create a new user from Discord OAuth"""
+def _insert_discord_user(db: Session, user_data: schemas.DiscordUserCreate):
     db_user = models.User(
         email=user_data.email,
         full_name=user_data.full_name,
@@ -357,6 +421,10 @@ async def create_discord_user(db: Session, user_data: schemas.DiscordUserCreate)
     
     return db_user
 
+async def create_discord_user(db: Session, user_data: schemas.DiscordUserCreate):
+    """Create a new user from Discord OAuth"""
+    return await asyncio.to_thread(_insert_discord_user, db, user_data)
+
 def link_discord_account(db: Session, user: models.User, discord_data: dict):
     """Link Discord account to existing user"""
     user.discord_id = discord_data["id"]
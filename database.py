@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from decouple import config
@@ -67,17 +68,53 @@ except ImportError:
     # utils module might not be available during initial setup
     pass
 
+# Compiled-SQL cache entries per engine (SQLAlchemy default is 500).
+# Past this size the least recently used statements are evicted and recompiled on next use.
+QUERY_CACHE_SIZE = 1200
+
+# Server-side prepared statements cached per asyncpg connection
+PREPARED_STATEMENT_CACHE_SIZE = 256
+
+def get_postgres_connect_args(database_url):
+    """Driver-specific connect_args for PostgreSQL engines.
+
+    asyncpg prepares every statement; caching them per connection skips
+    re-parsing and re-planning repeated ORM queries. Other drivers need nothing.
+    """
+    if make_url(database_url).drivername == 'postgresql+asyncpg':
+        return {
+            'prepared_statement_cache_size': PREPARED_STATEMENT_CACHE_SIZE,
+            'statement_cache_size': PREPARED_STATEMENT_CACHE_SIZE,
+        }
+    return {}
+
+# Connection pool - tunable per deployment without code changes. Sized per
+# uvicorn worker: (pool_size + max_overflow) x workers must stay under the
+# server's max_connections.
+POSTGRES_POOL_ARGS = {
+    'pool_size': config('DB_POOL_SIZE', default=20, cast=int),
+    'max_overflow': config('DB_MAX_OVERFLOW', default=10, cast=int),
+    'pool_timeout': config('DB_POOL_TIMEOUT', default=30, cast=int),
+    # Replace connections before typical 1h idle cutoffs on proxies/load balancers
+    'pool_recycle': config('DB_POOL_RECYCLE', default=1800, cast=int),
+    'pool_pre_ping': True,  # Drop connections Postgres closed while idle
+}
+
 # Create engine based on database type
 if db_config['type'] == 'sqlite':
     engine = create_engine(
         DATABASE_URL, 
         connect_args={"check_same_thread": False, "timeout": 5},
-        echo=ENVIRONMENT == 'development'
+        echo=ENVIRONMENT == 'development',
+        query_cache_size=QUERY_CACHE_SIZE
     )
 else:  # postgresql
     engine = create_engine(
         DATABASE_URL,
-        echo=ENVIRONMENT == 'development'
+        connect_args=get_postgres_connect_args(DATABASE_URL),
+        echo=ENVIRONMENT == 'development',
+        query_cache_size=QUERY_CACHE_SIZE,
+        **POSTGRES_POOL_ARGS
     )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -91,17 +128,76 @@ def get_db():
     finally:
         db.close()
 
+# Async drivers for the same database - used by endpoints that must not hold a
+# threadpool slot while waiting on the DB (health probes). CRUD routes stay sync.
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+def get_async_database_url(database_url):
+    """DATABASE_URL rewritten to the async driver for its backend."""
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]).render_as_string(hide_password=False)
+
+_async_session_factory = None
+
+def get_async_session_factory():
+    """Create the async engine on first use so sync-only installs can still import this module."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        async_url = get_async_database_url(DATABASE_URL)
+        if db_config['type'] == 'sqlite':
+            async_engine = create_async_engine(
+                async_url,
+                connect_args={"timeout": 5},
+                query_cache_size=QUERY_CACHE_SIZE
+            )
+            register_sqlite_pragmas(async_engine.sync_engine)
+        else:  # postgresql
+            async_engine = create_async_engine(
+                async_url,
+                connect_args=get_postgres_connect_args(async_url),
+                query_cache_size=QUERY_CACHE_SIZE,
+                # Same timeouts/recycling as the sync pool, fewer persistent connections
+                **{**POSTGRES_POOL_ARGS, 'pool_size': config('DB_ASYNC_POOL_SIZE', default=5, cast=int)}
+            )
+        _async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    return _async_session_factory
+
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
+
 # Ensure SQLite uses WAL and reasonable sync settings for concurrency
-try:
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA mmap_size=268435456;",  # 256 MB memory-mapped reads
+    "PRAGMA cache_size=-64000;",  # 64 MB page cache
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA wal_autocheckpoint=1000;",
+    # Long-lived pooled connections: SQLite recommends optimize on open
+    "PRAGMA optimize=0x10002;",
+)
+
+def register_sqlite_pragmas(sqlite_engine):
+    """Apply SQLITE_PRAGMAS to every new connection of a SQLite engine."""
     from sqlalchemy import event
+
+    @event.listens_for(sqlite_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+try:
     if db_config['type'] == 'sqlite':
-        @event.listens_for(engine, "connect")
-        def set_sqlite_pragmas(dbapi_connection, connection_record):
-            cursor = dbapi_connection.cursor()
-            try:
-                cursor.execute("PRAGMA journal_mode=WAL;")
-                cursor.execute("PRAGMA synchronous=NORMAL;")
-            finally:
-                cursor.close()
+        register_sqlite_pragmas(engine)
 except Exception:
     pass
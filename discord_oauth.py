@@ -1,13 +1,47 @@
 import httpx
+import json
 from typing import Optional, Dict
+from urllib.parse import quote, urlencode
 from decouple import config
 from fastapi import HTTPException, status
 
+try:
+    import orjson as _json  # Parses response bytes directly, no str decode step
+except ImportError:
+    _json = json
+
+try:
+    import h2  # noqa: F401 - httpx's HTTP/2 transport (httpx[http2])
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
 # Discord OAuth Configuration
 DISCORD_CLIENT_ID = config('DISCORD_CLIENT_ID', default='')
 DISCORD_CLIENT_SECRET = config('DISCORD_CLIENT_SECRET', default='')
 DISCORD_REDIRECT_URI = config('DISCORD_REDIRECT_URI', default='http://localhost:3000/auth/discord/callback')
 
+# Authorization URL depends only on the config above - built once at import
+_AUTHORIZATION_URL = "https://discord.com/api/oauth2/authorize?" + urlencode({
+    'client_id': DISCORD_CLIENT_ID,
+    'redirect_uri': DISCORD_REDIRECT_URI,
+    'response_type': 'code',
+    'scope': 'identify email'
+}, quote_via=quote)
+
+# Shared HTTP client - keeps the discord.com connection (TCP + TLS) alive between OAuth calls
+_client: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=_HTTP2,  # Concurrent callbacks multiplex over one connection instead of opening more
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _client
+
 class DiscordOAuth:
     BASE_URL = "https://discord.com/api"
     
@@ -20,15 +54,7 @@ class DiscordOAuth:
                 detail="Discord OAuth not configured"
             )
         
-        params = {
-            'client_id': DISCORD_CLIENT_ID,
-            'redirect_uri': DISCORD_REDIRECT_URI,
-            'response_type': 'code',
-            'scope': 'identify email'
-        }
-        
-        query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
-        return f"https://discord.com/api/oauth2/authorize?{query_string}"
+        return _AUTHORIZATION_URL
     
     @staticmethod
     async def exchange_code_for_token(code: str) -> Dict:
@@ -49,20 +75,19 @@ class DiscordOAuth:
         
         headers = {'Content-Type': 'application/x-www-form-urlencoded'}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{DiscordOAuth.BASE_URL}/oauth2/token",
-                data=data,
-                headers=headers
+        response = await _get_client().post(
+            f"{DiscordOAuth.BASE_URL}/oauth2/token",
+            data=data,
+            headers=headers
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to exchange code for token"
             )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to exchange code for token"
-                )
-            
-            return response.json()
+        
+        return _json.loads(response.content)
     
     @staticmethod
     async def get_user_info(access_token: str) -> Dict:
@@ -72,16 +97,23 @@ class DiscordOAuth:
             'Content-Type': 'application/json'
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{DiscordOAuth.BASE_URL}/users/@me",
-                headers=headers
+        response = await _get_client().get(
+            f"{DiscordOAuth.BASE_URL}/users/@me",
+            headers=headers
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to get Discord user info"
             )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to get Discord user info"
-                )
-            
-            return response.json()
\ No newline at end of file
+        
+        return _json.loads(response.content)
+    
+    @staticmethod
+    async def aclose():
+        """Close the shared HTTP client (app shutdown)"""
+        global _client
+        if _client is not None:
+            await _client.aclose()
+            _client = None
\ No newline at end of file
@@ -17,6 +17,8 @@ print('Creating SQLite database tables...')
 models.Base.metadata.create_all(bind=database.engine)
 print('✅ Database tables ready!')
 "
+# Tables exist now - the uvicorn workers skip their own create_all on startup
+export DB_TABLES_READY=1
 
 echo "🌐 Starting FastAPI server..."
 exec "$@"
\ No newline at end of file
@@ -8,17 +8,92 @@ Enables semantic search across knowledge base for computational mindfulness prac
 
 import json
 import hashlib
+import os
 import pickle
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Union, Set
+from typing import List, Dict, Iterator, Tuple, Optional, Union, Set
 from dataclasses import dataclass
 import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
+try:
+    import faiss  # Optional: approximate nearest-neighbour index for large collections
+except ImportError:
+    faiss = None
+
+
+# Unit-normalized components lie in [-1, 1], so a fixed symmetric scale suffices
+_INT8_SCALE = 127
+
+
+# Below this many paragraphs an exact scan is already sub-millisecond
+ANN_MIN_DOCUMENTS = 2000
+# Vector candidates fetched per requested result before hybrid re-ranking
+ANN_OVERFETCH = 3
+
+# Paragraph texts handed to the model per encode call while building the index;
+# bounds the transient text copies without starving the batch_size=64 forward pass
+ENCODE_CHUNK_SIZE = 1024
+
+# Threads used to read markdown files; overlaps per-file IO latency
+READ_WORKERS = min(8, os.cpu_count() or 1)
+
+# Hybrid score weights (favor vector similarity for semantic search)
+VECTOR_WEIGHT = 0.7
+STRING_WEIGHT = 0.3
+
+# Encoded queries kept for repeat check-ins
+QUERY_CACHE_SIZE = 1024
+
+
+# Bump when the cached document layout changes so stale pickles are rebuilt
+DOCUMENT_CACHE_VERSION = 4
+
+# Per-paragraph fields, stored column-wise: one list per field, indexed by document id
+DOCUMENT_FIELDS = (
+    'file_path', 'file_title', 'title', 'content', 'context', 'section',
+    'para_index', 'themes', 'word_count', 'content_lower', 'word_set'
+)
+# Numeric columns are packed into arrays once the index is built
+_NUMERIC_FIELDS = ('para_index', 'word_count')
+
+
+# Theme extraction patterns, compiled once for the whole index build
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z\s]')
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_ITALIC_RE = re.compile(r'\*([^*]+)\*')
+_KEY_PHRASE_RE = re.compile(r'\b(?:process|pattern|system|approach|method|technique|concept|principle)\w*\b')
+
+
+def _safe_read(path: Path) -> Tuple[Optional[str], Optional[Exception]]:
+    """Read a file, returning (content, None) or (None, error) so one bad file doesn't stop a batch"""
+    try:
+        return path.read_text(), None
+    except Exception as e:
+        return None, e
+
+
+def _select_device() -> str:
+    """Fastest available torch device for the sentence transformer"""
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def _quantize_int8(vectors: np.ndarray) -> np.ndarray:
+    """Symmetric int8 quantization of unit-normalized embeddings"""
+    return np.clip(np.rint(vectors * _INT8_SCALE), -_INT8_SCALE, _INT8_SCALE).astype(np.int8)
+
 
 @dataclass
 class MindfulSearchResult:
@@ -52,9 +127,16 @@ class MindfulVectorSearch:
     def __init__(self, 
                  docs_dir: Optional[Path] = None,
                  cache_dir: Optional[Path] = None,
-                 model_name: str = "all-MiniLM-L6-v2"):
+                 model_name: str = "all-MiniLM-L6-v2",
+                 precision: str = "float32",
+                 deep_check: bool = False):
+        
+        if precision not in ("float32", "int8"):
+            raise ValueError(f"Unsupported precision: {precision}. Use 'float32' or 'int8'")
         
         self.model_name = model_name
+        self.precision = precision  # int8: 4x smaller index, approximate scores
+        self.deep_check = deep_check  # True: hash file contents instead of stat metadata (CI)
         self.model = None  # Lazy load
         
         # Directories
@@ -62,38 +144,68 @@ class MindfulVectorSearch:
         self.cache_dir = cache_dir or Path(__file__).parent / "search_cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Cache file paths, fixed for the lifetime of the instance. Documents, embeddings
+        # and content hash are one artifact set per model + precision, so a rebuild at
+        # one precision never pairs its documents with the other precision's matrix
+        cache_key = f"{model_name.replace('/', '_')}_{precision}"
+        self._documents_file = self.cache_dir / f"documents_{cache_key}.v{DOCUMENT_CACHE_VERSION}.pkl"
+        self._embeddings_file = self.cache_dir / f"embeddings_{cache_key}.npy"
+        self._ann_file = self.cache_dir / f"hnsw_{cache_key}.faiss"
+        self._hash_file = self.cache_dir / f"content_hash_{cache_key}.txt"
+        
         # Index storage
-        self.documents = []
+        self.columns: Dict[str, list] = {field: [] for field in DOCUMENT_FIELDS}
         self.embeddings = None
+        self.ann_index = None  # FAISS HNSW index, float32 + large collections only
         self.content_hash = None
+        self._query_cache: OrderedDict = OrderedDict()  # query -> unit embedding, LRU
+    
+    @property
+    def document_count(self) -> int:
+        return len(self.columns['content'])
     
     def _get_model(self):
         """Lazy load sentence transformer"""
         if self.model is None:
-            print(f"🧠 Loading sentence transformer: {self.model_name}")
-            self.model = SentenceTransformer(self.model_name)
+            device = _select_device()
+            print(f"🧠 Loading sentence transformer: {self.model_name} ({device})")
+            self.model = SentenceTransformer(self.model_name, device=device)
         return self.model
     
     def _compute_content_hash(self) -> str:
-        """Compute hash of all markdown content for change detection"""
+        """Fingerprint the markdown files for change detection
+        
+        Path, size and mtime from os.stat are enough to notice edits without
+        reading the files; deep_check hashes the full contents instead.
+        """
         md_files = list(self.docs_dir.rglob("*.md"))
         if not md_files:
             return ""
         
-        combined = ""
+        if self.deep_check:
+            digest = hashlib.md5()
+            with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+                for content, error in executor.map(_safe_read, sorted(md_files)):
+                    if error is None:
+                        digest.update((content + "\n").encode())
+            return digest.hexdigest()
+        
+        fingerprint = hashlib.blake2b(digest_size=16)
         for file in sorted(md_files):
             try:
-                combined += file.read_text() + "\n"
-            except:
+                stat = file.stat()
+            except OSError:
                 continue
-        return hashlib.md5(combined.encode()).hexdigest()
+            fingerprint.update(f"{file}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+        return fingerprint.hexdigest()
     
     def _load_cache(self) -> bool:
         """Load embeddings and documents from cache if unchanged"""
-        cache_file = self.cache_dir / f"embeddings_{self.model_name.replace('/', '_')}.pkl"
-        hash_file = self.cache_dir / "content_hash.txt"
+        cache_file = self._documents_file
+        embeddings_file = self._embeddings_file
+        hash_file = self._hash_file
         
-        if not cache_file.exists() or not hash_file.exists():
+        if not cache_file.exists() or not embeddings_file.exists() or not hash_file.exists():
             return False
         
         try:
@@ -105,15 +217,23 @@ class MindfulVectorSearch:
                 print("📝 Content changed, rebuilding index...")
                 return False
             
-            # Load from cache
+            # Load from cache - embeddings are memory-mapped, paged in on first use
             with open(cache_file, 'rb') as f:
-                cache_data = pickle.load(f)
+                columns = pickle.load(f)
+            embeddings = np.load(embeddings_file, mmap_mode='r')
+            if len(embeddings) != len(columns['content']):
+                print("📝 Cached embeddings don't match cached documents, rebuilding index...")
+                return False
             
-            self.embeddings = cache_data['embeddings']
-            self.documents = cache_data['documents']
+            self.columns = columns
+            self.embeddings = embeddings
             self.content_hash = cached_hash
             
-            print(f"⚡ Loaded {len(self.documents)} documents from cache")
+            ann_file = self._ann_index_file()
+            if ann_file is not None and ann_file.exists():
+                self.ann_index = faiss.read_index(str(ann_file))
+            
+            print(f"⚡ Loaded {self.document_count} documents from cache")
             return True
             
         except Exception as e:
@@ -127,73 +247,110 @@ class MindfulVectorSearch:
         
         # Find all markdown files
         md_files = list(self.docs_dir.rglob("*.md"))
-        self.documents = []
-        
-        for file_path in md_files:
-            try:
-                content = file_path.read_text()
-                
-                # Extract file title from first heading or filename
-                lines = content.split('\n')
-                file_title = None
-                for line in lines[:10]:
-                    if line.startswith('# '):
-                        file_title = line[2:].strip()
-                        break
-                if not file_title:
-                    file_title = file_path.stem.replace('-', ' ').replace('_', ' ').title()
+        columns = {field: [] for field in DOCUMENT_FIELDS}
+        
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+            # map() yields in file order while later files are still being read
+            for file_path, (content, error) in zip(md_files, executor.map(_safe_read, md_files)):
+                try:
+                    if error is not None:
+                        raise error
+                    
+                    # Extract file title from first heading or filename
+                    lines = content.split('\n')
+                    file_title = None
+                    for line in lines[:10]:
+                        if line.startswith('# '):
+                            file_title = line[2:].strip()
+                            break
+                    if not file_title:
+                        file_title = file_path.stem.replace('-', ' ').replace('_', ' ').title()
                 
-                # Split into paragraphs and sections
-                paragraphs = self._extract_paragraphs(content)
-                
-                for para_idx, paragraph_data in enumerate(paragraphs):
-                    if len(paragraph_data['text'].strip()) > 50:  # Skip very short paragraphs
-                        doc = {
-                            'file_path': file_path,
-                            'file_title': file_title,
-                            'title': paragraph_data['title'],
-                            'content': paragraph_data['text'],
-                            'context': paragraph_data['context'],
-                            'section': paragraph_data['section'],
-                            'para_index': para_idx,
-                            'themes': self._extract_themes(paragraph_data['text']),
-                            'word_count': len(paragraph_data['text'].split())
-                        }
-                        self.documents.append(doc)
+                    # Split into paragraphs and sections (streamed, never materialized as a list)
+                    for para_idx, paragraph_data in enumerate(self._extract_paragraphs(content)):
+                        if len(paragraph_data['text'].strip()) > 50:  # Skip very short paragraphs
+                            text = paragraph_data['text']
+                            # Lowercase text and word set are precomputed so string scoring is set lookups only
+                            text_lower = text.lower()
+                            columns['file_path'].append(file_path)
+                            columns['file_title'].append(file_title)
+                            columns['title'].append(paragraph_data['title'])
+                            columns['content'].append(text)
+                            columns['context'].append(paragraph_data['context'])
+                            columns['section'].append(paragraph_data['section'])
+                            columns['para_index'].append(para_idx)
+                            columns['themes'].append(self._extract_themes(text))
+                            columns['word_count'].append(len(text.split()))
+                            columns['content_lower'].append(text_lower)
+                            columns['word_set'].append(frozenset(text_lower.split()))
                 
-            except Exception as e:
-                print(f"⚠️  Error reading {file_path}: {e}")
-                continue
+                except Exception as e:
+                    print(f"⚠️  Error reading {file_path}: {e}")
+                    continue
+        
+        for field in _NUMERIC_FIELDS:
+            columns[field] = np.asarray(columns[field], dtype=np.int32)
+        self.columns = columns
         
         # Generate embeddings
-        if self.documents:
-            texts = [f"{doc['title']}\n\n{doc['content']}" for doc in self.documents]
+        if self.document_count:
+            count = self.document_count
             model = self._get_model()
-            print(f"🚀 Encoding {len(texts)} documents...")
-            self.embeddings = model.encode(texts, show_progress_bar=True, convert_to_tensor=False)
-            
-            # Cache results
-            cache_data = {
-                'embeddings': self.embeddings,
-                'documents': self.documents
-            }
+            print(f"🚀 Encoding {count} documents...")
+            # Stream chunks into a preallocated matrix rather than building every text up front.
+            # Encode and unit-normalize on the model's device, then copy each chunk to the host;
+            # unit length makes search a plain dot product = cosine similarity
+            self.embeddings = np.empty((count, model.get_sentence_embedding_dimension()), dtype=np.float32)
+            for start in range(0, count, ENCODE_CHUNK_SIZE):
+                stop = min(start + ENCODE_CHUNK_SIZE, count)
+                texts = [f"{columns['title'][i]}\n\n{columns['content'][i]}" for i in range(start, stop)]
+                embeddings = model.encode(
+                    texts, batch_size=64, show_progress_bar=False,
+                    convert_to_tensor=True, normalize_embeddings=True
+                )
+                self.embeddings[start:stop] = embeddings.cpu().numpy()
+            if self.precision == "int8":
+                self.embeddings = _quantize_int8(self.embeddings)
             
-            cache_file = self.cache_dir / f"embeddings_{self.model_name.replace('/', '_')}.pkl"
-            hash_file = self.cache_dir / "content_hash.txt"
+            self._build_ann_index()
             
-            with open(cache_file, 'wb') as f:
-                pickle.dump(cache_data, f)
+            # Cache results - raw .npy for the embeddings so loads can mmap
+            with open(self._documents_file, 'wb') as f:
+                pickle.dump(self.columns, f)
+            np.save(self._embeddings_file, self.embeddings)
             
             self.content_hash = self._compute_content_hash()
-            hash_file.write_text(self.content_hash)
+            self._hash_file.write_text(self.content_hash)
         
         build_time = time.time() - start_time
-        print(f"✅ Built index in {build_time:.2f}s ({len(self.documents)} documents)")
+        print(f"✅ Built index in {build_time:.2f}s ({self.document_count} documents)")
     
-    def _extract_paragraphs(self, content: str) -> List[Dict]:
-        """Extract paragraphs with context and section information"""
+    def _ann_index_file(self) -> Optional[Path]:
+        """FAISS index cache path, or None when ANN search does not apply"""
+        if faiss is None or self.precision != "float32":
+            return None
+        return self._ann_file
+    
+    def _build_ann_index(self):
+        """Build (and cache) an HNSW index when FAISS is installed and the collection is large"""
+        self.ann_index = None
+        ann_file = self._ann_index_file()
+        if ann_file is None:
+            return
+        if self.document_count < ANN_MIN_DOCUMENTS:
+            ann_file.unlink(missing_ok=True)
+            return
+        
+        # Inner product on unit vectors == cosine similarity
+        index = faiss.IndexHNSWFlat(self.embeddings.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+        index.add(np.ascontiguousarray(self.embeddings, dtype=np.float32))
+        faiss.write_index(index, str(ann_file))
+        self.ann_index = index
+    
+    def _extract_paragraphs(self, content: str) -> Iterator[Dict]:
+        """Yield paragraphs with context and section information"""
         lines = content.split('\n')
-        paragraphs = []
+        emitted = 0
         
         current_section = "Introduction"
         current_paragraph = []
@@ -213,12 +370,13 @@ class MindfulVectorSearch:
                 if current_paragraph:
                     para_text = '\n'.join(current_paragraph).strip()
                     if para_text and len(para_text) > 20:
-                        paragraphs.append({
+                        emitted += 1
+                        yield {
                             'text': para_text,
-                            'title': f"{current_section} - Para {len(paragraphs) + 1}",
+                            'title': f"{current_section} - Para {emitted}",
                             'section': current_section,
                             'context': f"From {current_section}"
-                        })
+                        }
                 
                 # Start new paragraph
                 current_paragraph = [line]
@@ -235,14 +393,12 @@ class MindfulVectorSearch:
         if current_paragraph:
             para_text = '\n'.join(current_paragraph).strip()
             if para_text and len(para_text) > 20:
-                paragraphs.append({
+                yield {
                     'text': para_text,
-                    'title': f"{current_section} - Para {len(paragraphs) + 1}",
+                    'title': f"{current_section} - Para {emitted + 1}",
                     'section': current_section,
                     'context': f"From {current_section}"
-                })
-        
-        return paragraphs
+                }
     
     def _extract_themes(self, content: str) -> List[str]:
         """Extract semantic themes from content"""
@@ -253,22 +409,21 @@ class MindfulVectorSearch:
             if line.startswith('##'):
                 theme = line[2:].strip().lower()
                 # Clean up theme
-                theme = re.sub(r'[^a-zA-Z\s]', '', theme).strip()
+                theme = _NON_ALPHA_RE.sub('', theme).strip()
                 if theme and len(theme) > 3:
                     themes.add(theme)
         
         # Look for emphasized concepts (words in **bold** or *italic*)
-        bold_matches = re.findall(r'\*\*([^*]+)\*\*', content)
-        italic_matches = re.findall(r'\*([^*]+)\*', content)
+        bold_matches = _BOLD_RE.findall(content)
+        italic_matches = _ITALIC_RE.findall(content)
         
         for match in bold_matches + italic_matches:
-            clean_match = re.sub(r'[^a-zA-Z\s]', '', match).strip().lower()
+            clean_match = _NON_ALPHA_RE.sub('', match).strip().lower()
             if clean_match and len(clean_match) > 3:
                 themes.add(clean_match)
         
         # Look for key conceptual phrases
-        key_phrases = re.findall(r'\b(?:process|pattern|system|approach|method|technique|concept|principle)\w*\b', 
-                                content.lower())
+        key_phrases = _KEY_PHRASE_RE.findall(content.lower())
         for phrase in key_phrases:
             if len(phrase) > 3:
                 themes.add(phrase)
@@ -281,34 +436,29 @@ class MindfulVectorSearch:
             if not self._load_cache():
                 self._build_index()
     
-    def _compute_string_score(self, query: str, content: str) -> float:
-        """Compute string matching score"""
-        query_lower = query.lower()
-        content_lower = content.lower()
-        
+    def _compute_string_score(self, query_lower: str, query_words: List[str], i: int) -> float:
+        """Compute string matching score for document i"""
         # Exact phrase match gets high score
-        if query_lower in content_lower:
-            return len(query) / len(content) * 100
+        if query_lower in self.columns['content_lower'][i]:
+            return len(query_lower) / len(self.columns['content'][i]) * 100
         
         # Word-based matching
-        query_words = query_lower.split()
-        content_words = content_lower.split()
-        
-        matches = sum(1 for word in query_words if word in content_words)
+        word_set = self.columns['word_set'][i]
+        matches = sum(1 for word in query_words if word in word_set)
         if matches > 0:
             return matches / len(query_words) * 10
         
         return 0.0
     
-    def _extract_snippets(self, query: str, content: str, max_snippets: int = 3) -> List[str]:
+    def _extract_snippets(self, query_lower: str, doc_index: int, max_snippets: int = 3) -> List[str]:
         """Extract relevant snippets around query matches"""
-        query_lower = query.lower()
-        
         snippets = []
-        lines = content.split('\n')
+        lines = self.columns['content'][doc_index].split('\n')
+        # Matching runs on the precomputed lowercase text, line for line
+        lines_lower = self.columns['content_lower'][doc_index].split('\n')
         
-        for i, line in enumerate(lines):
-            if query_lower in line.lower():
+        for i, line in enumerate(lines_lower):
+            if query_lower in line:
                 # Get context around the match
                 start = max(0, i - 1)
                 end = min(len(lines), i + 2)
@@ -325,6 +475,95 @@ class MindfulVectorSearch:
         
         return snippets
     
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Unit-length query embeddings; cache misses go to the model in one batch"""
+        missing = [q for q in dict.fromkeys(queries) if q not in self._query_cache]
+        if missing:
+            encoded = np.asarray(
+                self._get_model().encode(missing, batch_size=32, convert_to_numpy=True),
+                dtype=np.float32
+            )
+            encoded /= np.maximum(np.linalg.norm(encoded, axis=1, keepdims=True), 1e-12)
+            for query, embedding in zip(missing, encoded):
+                self._query_cache[query] = embedding
+        
+        rows = []
+        for query in queries:
+            self._query_cache.move_to_end(query)
+            rows.append(self._query_cache[query])
+        while len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return np.stack(rows)
+    
+    def _vector_candidates(self, query_embeddings: np.ndarray, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """(document indices, cosine similarities) candidate arrays for each query row"""
+        if self.ann_index is not None:
+            # Approximate search: only the overfetched neighbours are re-ranked
+            scores, indices = self.ann_index.search(query_embeddings, top_k * ANN_OVERFETCH)
+            found = indices >= 0
+            return [
+                (row_indices[row_found], row_scores[row_found].astype(np.float64))
+                for row_indices, row_scores, row_found in zip(indices, scores, found)
+            ]
+        
+        # Exact search: one matmul for the whole batch (both sides are unit length)
+        if self.precision == "int8":
+            # int8 x int8 accumulated in int32, then rescaled back to [-1, 1]
+            similarities = np.einsum(
+                'nd,qd->qn', self.embeddings, _quantize_int8(query_embeddings), dtype=np.int32, casting='safe'
+            ) / float(_INT8_SCALE * _INT8_SCALE)
+        else:
+            similarities = (query_embeddings @ self.embeddings.T).astype(np.float64)
+        all_documents = np.arange(self.document_count)
+        return [(all_documents, row) for row in similarities]
+    
+    def _rank(self,
+              query: str,
+              indices: np.ndarray,
+              vector_scores: np.ndarray,
+              top_k: int,
+              min_score: float) -> List[MindfulSearchResult]:
+        """Hybrid-score vector candidates and keep the best top_k"""
+        query_lower = query.lower()
+        query_words = query_lower.split()
+        
+        string_scores = np.fromiter(
+            (self._compute_string_score(query_lower, query_words, i) for i in indices.tolist()),
+            dtype=np.float64, count=len(indices)
+        )
+        
+        # Weighted combination and threshold over the whole candidate set at once
+        combined_scores = vector_scores * VECTOR_WEIGHT + string_scores * STRING_WEIGHT
+        passing = np.flatnonzero(combined_scores >= min_score)
+        
+        # Partial top-k selection (O(N)), then sort just those k
+        if 0 < top_k < len(passing):
+            passing = passing[np.argpartition(-combined_scores[passing], top_k - 1)[:top_k]]
+        order = passing[np.argsort(-combined_scores[passing], kind='stable')][:top_k]
+        
+        # Snippets and result objects are only built for the survivors
+        columns = self.columns
+        results = []
+        for j in order.tolist():
+            i = int(indices[j])
+            result = MindfulSearchResult(
+                file_path=columns['file_path'][i],
+                file_title=columns['file_title'][i],
+                title=columns['title'][i], 
+                content=columns['content'][i],
+                section=columns['section'][i],
+                context=columns['context'][i],
+                para_index=int(columns['para_index'][i]),
+                vector_score=float(vector_scores[j]),
+                string_score=float(string_scores[j]),
+                combined_score=float(combined_scores[j]),
+                matching_snippets=self._extract_snippets(query_lower, i),
+                semantic_themes=columns['themes'][i]
+            )
+            results.append(result)
+        
+        return results
+    
     def search(self, 
                query: str,
                top_k: int = 5,
@@ -337,63 +576,45 @@ class MindfulVectorSearch:
             top_k: Number of results to return  
             min_score: Minimum combined score threshold
         """
+        return self.search_many([query], top_k=top_k, min_score=min_score)[0]
+    
+    def search_many(self,
+                    queries: List[str],
+                    top_k: int = 5,
+                    min_score: float = 0.1) -> List[Tuple[List[MindfulSearchResult], SearchStats]]:
+        """
+        Search several queries with one batched encode and one similarity matmul
+        
+        Returns one (results, stats) pair per query, in input order.
+        """
         start_time = time.time()
         
         # Ensure index is built
         self.ensure_index_built()
         
-        if not self.documents or self.embeddings is None:
-            return [], SearchStats(query, 0, 0, False)
-        
-        # Encode query
-        model = self._get_model()
-        query_embedding = model.encode([query], convert_to_tensor=False)
-        
-        # Compute vector similarities (cosine similarity)
-        similarities = np.dot(self.embeddings, query_embedding.T).flatten()
-        
-        # Create results with hybrid scoring
-        results = []
-        for i, doc in enumerate(self.documents):
-            vector_score = float(similarities[i])
-            string_score = self._compute_string_score(query, doc['content'])
-            
-            # Weighted combination (favor vector similarity for semantic search)
-            combined_score = (vector_score * 0.7) + (string_score * 0.3)
-            
-            if combined_score >= min_score:
-                snippets = self._extract_snippets(query, doc['content'])
-                
-                result = MindfulSearchResult(
-                    file_path=doc['file_path'],
-                    file_title=doc['file_title'],
-                    title=doc['title'], 
-                    content=doc['content'],
-                    section=doc['section'],
-                    context=doc['context'],
-                    para_index=doc['para_index'],
-                    vector_score=vector_score,
-                    string_score=string_score,
-                    combined_score=combined_score,
-                    matching_snippets=snippets,
-                    semantic_themes=doc['themes']
-                )
-                results.append(result)
-        
-        # Sort by combined score and take top results
-        results.sort(key=lambda x: x.combined_score, reverse=True)
-        top_results = results[:top_k]
-        
-        search_time = (time.time() - start_time) * 1000
-        stats = SearchStats(
-            query=query,
-            total_results=len(top_results),
-            search_time_ms=search_time,
-            cache_hit=self.content_hash is not None
-        )
-        
-        return top_results, stats
-
+        if not self.document_count or self.embeddings is None:
+            return [([], SearchStats(query, 0, 0, False)) for query in queries]
+        if not queries:
+            return []
+        
+        query_embeddings = self._encode_queries(queries)
+        all_candidates = self._vector_candidates(query_embeddings, top_k)
+        
+        ranked = []
+        for query, (indices, vector_scores) in zip(queries, all_candidates):
+            ranked.append(self._rank(query, indices, vector_scores, top_k, min_score))
+        
+        # Encode and matmul are shared, so each query is charged an equal share
+        search_time = (time.time() - start_time) * 1000 / len(queries)
+        return [
+            (top_results, SearchStats(
+                query=query,
+                total_results=len(top_results),
+                search_time_ms=search_time,
+                cache_hit=self.content_hash is not None
+            ))
+            for query, top_results in zip(queries, ranked)
+        ]
 
 if __name__ == "__main__":
     # Demo usage
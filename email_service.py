@@ -1,102 +1,321 @@
+import asyncio
+import base64
+import logging
 import os
+import queue
 import smtplib
 import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
-import secrets
+from string import Template
 from typing import Optional
 
 # Load environment variables from current directory
 load_dotenv(".env")
 
-class GmailEmailService:
+# Mail credentials are read once per process
+GMAIL_EMAIL = os.getenv("GMAIL_EMAIL")
+GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD") or os.getenv("MAIL_APP_PASSWORD")  # App-specific password
+MAIL_ENABLED = bool(GMAIL_EMAIL and GMAIL_APP_PASSWORD)
+
+logger = logging.getLogger(__name__)
+
+# SMTP connection pool - each connection pays TCP + STARTTLS + AUTH once, not per email
+SMTP_POOL_SIZE = 5
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100  # Recycle before Gmail starts throttling the session
+SMTP_IDLE_CHECK_SECONDS = 240  # NOOP idle connections before reuse; Gmail drops them after ~5 min
+SMTP_TIMEOUT = 30
+TLS_SESSION_TTL_SECONDS = 3600  # Resumed handshakes skip cert verify + key exchange
+
+class _TLSSessionCache:
+    """The most recent TLS session for the SMTP endpoint, offered for resumption until it expires"""
+    
     def __init__(self):
+        self._lock = threading.Lock()
+        self._session = None
+        self._stored_at = 0.0
+    
+    def get(self) -> Optional[ssl.SSLSession]:
+        with self._lock:
+            if self._session is not None and time.monotonic() - self._stored_at >= TLS_SESSION_TTL_SECONDS:
+                self._session = None
+            return self._session
+    
+    def store(self, session: Optional[ssl.SSLSession]):
+        if session is None:
+            return
+        with self._lock:
+            self._session = session
+            self._stored_at = time.monotonic()
+
+class _GmailSMTP(smtplib.SMTP):
+    """smtplib.SMTP with TLS session resumption and ESMTP PIPELINING"""
+    
+    tls_session: Optional[ssl.SSLSession] = None
+    
+    def starttls(self, context: ssl.SSLContext):
+        # Mirrors smtplib.SMTP.starttls, plus session= on wrap_socket
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("starttls"):
+            raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server.")
+        resp, reply = self.docmd("STARTTLS")
+        if resp != 220:
+            raise smtplib.SMTPResponseException(resp, reply)
+        self.sock = context.wrap_socket(self.sock, server_hostname=self._host, session=self.tls_session)
+        # Forget everything learned before TLS, as RFC 3207 requires
+        self.file = None
+        self.helo_resp = None
+        self.ehlo_resp = None
+        self.esmtp_features = {}
+        self.does_esmtp = False
+        return resp, reply
+    
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        """Same contract as smtplib.SMTP.sendmail, in one round trip before the body when pipelining"""
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("pipelining") or mail_options or rcpt_options:
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+        
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        if isinstance(msg, str):
+            msg = smtplib._fix_eols(msg).encode("ascii")
+        size = " size=%d" % len(msg) if self.has_extn("size") else ""
+        
+        # RFC 2920: MAIL, every RCPT and DATA go out in one write, replies come back in order
+        commands = ["mail FROM:%s%s" % (smtplib.quoteaddr(from_addr), size)]
+        commands += ["rcpt TO:%s" % smtplib.quoteaddr(addr) for addr in to_addrs]
+        commands.append("data")
+        self.send("".join(command + smtplib.CRLF for command in commands))
+        replies = [self.getreply() for _ in commands]
+        
+        mail_code, mail_resp = replies[0]
+        data_code, data_resp = replies[-1]
+        refused = {
+            addr: reply for addr, reply in zip(to_addrs, replies[1:-1]) if reply[0] not in (250, 251)
+        }
+        
+        if data_code == 354 and (mail_code != 250 or len(refused) == len(to_addrs)):
+            # The server opened DATA for a failed transaction; close it with an empty message
+            self.send(b"." + smtplib.bCRLF)
+            self.getreply()
+        if mail_code != 250:
+            self._abort(mail_code)
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        if len(refused) == len(to_addrs):
+            self._abort(replies[1][0])
+            raise smtplib.SMTPRecipientsRefused(refused)
+        if data_code != 354:
+            self._abort(data_code)
+            raise smtplib.SMTPDataError(data_code, data_resp)
+        
+        body = smtplib._quote_periods(msg)
+        if body[-2:] != smtplib.bCRLF:
+            body += smtplib.bCRLF
+        self.send(body + b"." + smtplib.bCRLF)
+        code, resp = self.getreply()
+        if code != 250:
+            self._abort(code)
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+    
+    def _abort(self, code: int):
+        # 421: the server is closing the channel, anything else just needs the transaction reset
+        if code == 421:
+            self.close()
+        else:
+            self._rset()
+
+class _PooledConnection:
+    """A logged-in SMTP session plus the bookkeeping needed to recycle it"""
+    
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+class GmailEmailService:
+    def __init__(self, pool_size: int = SMTP_POOL_SIZE):
         self.smtp_server = "smtp.gmail.com"
         self.port = 587  # For TLS
-        self.sender_email = os.getenv("GMAIL_EMAIL")
-        self.password = os.getenv("GMAIL_APP_PASSWORD") or os.getenv("MAIL_APP_PASSWORD")  # App-specific password
+        self.sender_email = GMAIL_EMAIL
+        self.password = GMAIL_APP_PASSWORD
+        self.enabled = MAIL_ENABLED
+        
+        if not self.enabled:
+            logger.warning(
+                "GMAIL_EMAIL or GMAIL_APP_PASSWORD not found - using email simulation mode. "
+                "To use Gmail, add GMAIL_EMAIL and GMAIL_APP_PASSWORD to the .env file"
+            )
+        
+        self._from_header = f"Freezer App <{self.sender_email}>"
+        
+        # One TLS context for every connection, so its sessions can be resumed
+        self._ssl_context = ssl.create_default_context()
+        self._tls_sessions = _TLSSessionCache()
         
-        if not self.sender_email or not self.password:
-            print("⚠️  WARNING: GMAIL_EMAIL or GMAIL_APP_PASSWORD not found - using email simulation mode")
-            print("💡 To use Gmail: Add GMAIL_EMAIL and GMAIL_APP_PASSWORD to .env file")
+        # Idle logged-in connections, and a cap on how many may be open at once
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+    
+    def _connect(self) -> _PooledConnection:
+        """Open a new SMTP session: TCP connect, STARTTLS, AUTH"""
+        server = _GmailSMTP(self.smtp_server, self.port, timeout=SMTP_TIMEOUT)
+        server.tls_session = self._tls_sessions.get()
+        try:
+            server.starttls(context=self._ssl_context)
+            server.login(self.sender_email, self.password)
+        except Exception:
+            self._close_quietly(server)
+            raise
+        # Read after AUTH: TLS 1.3 only delivers session tickets once the handshake has finished
+        self._tls_sessions.store(server.sock.session)
+        return _PooledConnection(server)
+    
+    @staticmethod
+    def _close_quietly(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def _checkout(self) -> _PooledConnection:
+        """Reuse an idle connection that still answers, or open a new one"""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            
+            if time.monotonic() - connection.last_used < SMTP_IDLE_CHECK_SECONDS:
+                return connection
+            try:
+                if connection.server.noop()[0] == 250:
+                    return connection
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_quietly(connection.server)
+    
+    def _deliver(self, to_email: str, payload: str) -> Optional[Exception]:
+        """Send one rendered message over a pooled connection; None if sent, otherwise the error"""
+        with self._slots:
+            connection = None
+            error = None
+            try:
+                connection = self._checkout()
+                try:
+                    connection.server.sendmail(self.sender_email, to_email, payload)
+                except smtplib.SMTPServerDisconnected:
+                    # The server closed the idle connection - retry once on a fresh one
+                    connection.server.close()
+                    connection = self._connect()
+                    connection.server.sendmail(self.sender_email, to_email, payload)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                # sendmail already RSET the transaction; the session itself is still good
+                error = e
+            except Exception as e:
+                # Session state is unknown after a failure - drop it, the next send reconnects
+                if connection is not None:
+                    self._close_quietly(connection.server)
+                    connection = None
+                error = e
+            
+            if connection is not None:
+                connection.sent += 1
+                if connection.sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+                    self._close_quietly(connection.server)
+                else:
+                    connection.last_used = time.monotonic()
+                    self._idle.put(connection)
+        return error
+    
+    def close(self):
+        """QUIT every idle pooled connection"""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close_quietly(connection.server)
+    
+    def _render(self, to_email: str, subject: str, html_content: str, text_content: str) -> str:
+        message = MIMEMultipart("alternative")
+        message["Subject"] = subject
+        message["From"] = self._from_header
+        message["To"] = to_email
+        
+        # Add both plain text and HTML parts
+        text_part = MIMEText(text_content, "plain")
+        html_part = MIMEText(html_content, "html")
+        message.attach(text_part)
+        message.attach(html_part)
+        return message.as_string()
     
     def send_email(self, to_email: str, subject: str, html_content: str, text_content: str) -> bool:
         """Send email via Gmail SMTP"""
         
-        if not self.sender_email or not self.password:
-            # Fallback: log email content for development
-            print(f"\n📧 EMAIL SIMULATION MODE")
-            print(f"To: {to_email}")
-            print(f"Subject: {subject}")
-            print(f"Content: {text_content}")
-            print("=" * 50)
+        if not self.enabled:
+            # Fallback: log email content for development - nothing is sent, so the link must be visible
+            logger.warning("Email simulation mode - not sent\nTo: %s\nSubject: %s\n%s", to_email, subject, text_content)
             return True
         
         try:
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = f"Freezer App <{self.sender_email}>"
-            message["To"] = to_email
-            
-            # Add both plain text and HTML parts
-            text_part = MIMEText(text_content, "plain")
-            html_part = MIMEText(html_content, "html")
-            message.attach(text_part)
-            message.attach(html_part)
-            
-            # Create secure connection and send email
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_server, self.port) as server:
-                server.starttls(context=context)
-                server.login(self.sender_email, self.password)
-                server.sendmail(self.sender_email, to_email, message.as_string())
-            
-            print(f"✅ Gmail email sent successfully to {to_email}")
-            return True
-            
+            # Send over a pooled, already-authenticated connection
+            error = self._deliver(to_email, self._render(to_email, subject, html_content, text_content))
         except Exception as e:
-            print(f"❌ Gmail error: {e}")
-            # Fall back to simulation
-            print(f"\n📧 EMAIL FALLBACK MODE")
-            print(f"To: {to_email}")
-            print(f"Subject: {subject}")
-            print(f"Content: {text_content}")
-            print("=" * 50)
-            return False
+            error = e
+        
+        if error is None:
+            logger.debug("Gmail email sent to %s", to_email)
+            return True
+        
+        logger.error("Gmail error sending to %s: %s", to_email, error)
+        logger.debug("Unsent email\nTo: %s\nSubject: %s\n%s", to_email, subject, text_content)
+        return False
 
 # Global email service
 email_service = GmailEmailService()
 
+# Dedicated threads for blocking SMTP work - one per pooled connection, so slow sends
+# never tie up the threadpool shared by sync route handlers
+_MAIL_EXECUTOR = ThreadPoolExecutor(max_workers=SMTP_POOL_SIZE, thread_name_prefix="smtp")
+
+async def run_in_mail_executor(func, *args):
+    """Await a blocking email sender (e.g. send_verification_email) without blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(_MAIL_EXECUTOR, func, *args)
+
+_B64 = base64.urlsafe_b64encode
+
 def generate_verification_token():
-    return secrets.token_urlsafe(32)
+    # Same output as secrets.token_urlsafe(32): 32 bytes from the OS CSPRNG, URL-safe base64, unpadded
+    return _B64(os.urandom(32)).rstrip(b"=").decode("ascii")
 
-def send_verification_email(email: str, token: str, base_url: str = "http://localhost:3000") -> bool:
-    """Send verification email using Mailgun"""
-    verification_url = f"{base_url}/verify-email?token={token}"
-    
-    subject = "✅ Verify your Freezer App account"
-    
-    html_content = f"""
+# Email bodies are parsed once at import; each send only substitutes the per-recipient fields.
+# HTML bodies stay pure ASCII (emoji as character references) so MIMEText sends them 7bit,
+# with no base64 pass over the body.
+VERIFICATION_HTML = Template("""
     <html>
     <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
         <div style="background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%); padding: 30px; border-radius: 10px; color: white; text-align: center;">
-            <h1 style="margin: 0; font-size: 28px;">🧊 Welcome to Freezer App!</h1>
+            <h1 style="margin: 0; font-size: 28px;">&#x1F9CA; Welcome to Freezer App!</h1>
             <p style="margin: 10px 0 0 0; opacity: 0.9;">Please verify your email address</p>
         </div>
         
         <div style="padding: 30px 0;">
-            <p>Hi there! 👋</p>
+            <p>Hi there! &#x1F44B;</p>
             
             <p>Welcome to Freezer App! Please verify your email address to get started.</p>
             
             <div style="text-align: center; margin: 30px 0;">
-                <a href="{verification_url}" 
+                <a href="${verification_url}" 
                    style="background: #4CAF50; color: white; padding: 15px 30px; 
                           text-decoration: none; border-radius: 8px; font-weight: bold;
                           display: inline-block;">
-                    ✅ Verify Email Address
+                    &#x2705; Verify Email Address
                 </a>
             </div>
             
@@ -110,13 +329,13 @@ def send_verification_email(email: str, token: str, base_url: str = "http://loca
         </div>
     </body>
     </html>
-    """
-    
-    text_content = f"""
+    """)
+
+VERIFICATION_TEXT = Template("""
 Welcome to Freezer App!
 
 Please verify your email address by clicking this link:
-{verification_url}
+${verification_url}
 
 This link will expire in 24 hours.
 
@@ -124,35 +343,39 @@ If you didn't create this account, you can safely ignore this email.
 
 ---
 Freezer App - Keep your household inventory organized
-    """
-    
-    return email_service.send_email(email, subject, html_content, text_content)
+    """)
 
-def send_password_reset_email(email: str, token: str, user_name: str = "User", base_url: str = "http://localhost:3000") -> bool:
-    """Send password reset email using Mailgun"""
-    reset_url = f"{base_url}/reset-password?token={token}"
+def send_verification_email(email: str, token: str, base_url: str = "http://localhost:3000") -> bool:
+    """Send verification email using Mailgun"""
+    verification_url = f"{base_url}/verify-email?token={token}"
     
-    subject = "🔑 Password Reset - Freezer App"
+    subject = "✅ Verify your Freezer App account"
+    
+    html_content = VERIFICATION_HTML.substitute(verification_url=verification_url)
     
-    html_content = f"""
+    text_content = VERIFICATION_TEXT.substitute(verification_url=verification_url)
+    
+    return email_service.send_email(email, subject, html_content, text_content)
+
+PASSWORD_RESET_HTML = Template("""
     <html>
     <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
         <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 10px; color: white; text-align: center;">
-            <h1 style="margin: 0; font-size: 28px;">🧊 Freezer App</h1>
+            <h1 style="margin: 0; font-size: 28px;">&#x1F9CA; Freezer App</h1>
             <p style="margin: 10px 0 0 0; opacity: 0.9;">Password Reset Request</p>
         </div>
         
         <div style="padding: 30px 0;">
-            <p>Hi {user_name},</p>
+            <p>Hi ${user_name},</p>
             
             <p>We received a request to reset your password for your Freezer App account.</p>
             
             <div style="text-align: center; margin: 30px 0;">
-                <a href="{reset_url}" 
+                <a href="${reset_url}" 
                    style="background: #667eea; color: white; padding: 15px 30px; 
                           text-decoration: none; border-radius: 8px; font-weight: bold;
                           display: inline-block;">
-                    🔓 Reset My Password
+                    &#x1F513; Reset My Password
                 </a>
             </div>
             
@@ -172,17 +395,17 @@ def send_password_reset_email(email: str, token: str, user_name: str = "User", b
         </div>
     </body>
     </html>
-    """
-    
-    text_content = f"""
+    """)
+
+PASSWORD_RESET_TEXT = Template("""
 Password Reset - Freezer App
 
-Hi {user_name},
+Hi ${user_name},
 
 We received a request to reset your password for your Freezer App account.
 
 Click this link to reset your password:
-{reset_url}
+${reset_url}
 
 This link will expire in 1 hour for security reasons.
 
@@ -190,39 +413,59 @@ If you didn't request this reset, you can safely ignore this email.
 
 ---
 Freezer App - Keep your household inventory organized
-    """
+    """)
+
+def send_password_reset_email(email: str, token: str, user_name: str = "User", base_url: str = "http://localhost:3000") -> bool:
+    """Send password reset email using Mailgun"""
+    reset_url = f"{base_url}/reset-password?token={token}"
+    
+    subject = "🔑 Password Reset - Freezer App"
+    
+    html_content = PASSWORD_RESET_HTML.substitute(user_name=user_name, reset_url=reset_url)
+    
+    text_content = PASSWORD_RESET_TEXT.substitute(user_name=user_name, reset_url=reset_url)
     
     return email_service.send_email(email, subject, html_content, text_content)
 
-async def send_household_invitation(email: str, household_name: str, invite_code: str, inviter_name: str, base_url: str = "http://localhost:3000"):
-    join_url = f"{base_url}/join-household?code={invite_code}"
-    
-    html = f"""
+HOUSEHOLD_INVITATION_HTML = Template("""
     <html>
         <body>
             <h2>You're invited to join a household!</h2>
-            <p><strong>{inviter_name}</strong> has invited you to join the <strong>{household_name}</strong> household on Freezer App.</p>
+            <p><strong>${inviter_name}</strong> has invited you to join the <strong>${household_name}</strong> household on Freezer App.</p>
             <p>Click the link below to join:</p>
-            <a href="{join_url}" style="background-color: #4CAF50; color: white; padding: 14px 20px; text-decoration: none; border-radius: 4px;">
+            <a href="${join_url}" style="background-color: #4CAF50; color: white; padding: 14px 20px; text-decoration: none; border-radius: 4px;">
                 Join Household
             </a>
-            <p>Or use invite code: <strong>{invite_code}</strong></p>
+            <p>Or use invite code: <strong>${invite_code}</strong></p>
             <p>This invitation does not expire, but can be revoked by the household owner.</p>
         </body>
     </html>
-    """
-    
-    message = MessageSchema(
-        subject=f"Invitation to join {household_name} on Freezer App",
-        recipients=[email],
-        body=html,
-        subtype="html"
-    )
-    
-    try:
-        if conf.MAIL_USERNAME:  # Only send if email is configured
-            await fastmail.send_message(message)
-        return True
-    except Exception as e:
-        print(f"Failed to send household invitation: {e}")
-        return False
\ No newline at end of file
+    """)
+
+HOUSEHOLD_INVITATION_TEXT = Template("""
+You're invited to join a household!
+
+${inviter_name} has invited you to join the ${household_name} household on Freezer App.
+
+Click this link to join:
+${join_url}
+
+Or use invite code: ${invite_code}
+
+This invitation does not expire, but can be revoked by the household owner.
+
+---
+Freezer App - Keep your household inventory organized
+    """)
+
+def send_household_invitation(email: str, household_name: str, invite_code: str, inviter_name: str, base_url: str = "http://localhost:3000") -> bool:
+    """Send household invitation email"""
+    join_url = f"{base_url}/join-household?code={invite_code}"
+    
+    subject = f"Invitation to join {household_name} on Freezer App"
+    
+    fields = dict(inviter_name=inviter_name, household_name=household_name, join_url=join_url, invite_code=invite_code)
+    html_content = HOUSEHOLD_INVITATION_HTML.substitute(fields)
+    text_content = HOUSEHOLD_INVITATION_TEXT.substitute(fields)
+    
+    return email_service.send_email(email, subject, html_content, text_content)
@@ -1,17 +1,44 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, status, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import models, schemas, crud, database
 from auth import verify_token, get_current_user
-from database import get_db
+from database import get_db, get_async_db
+from config import REDIS_URL, RATE_LIMIT_STORAGE_URI, RATE_LIMIT_STRATEGY
 from discord_oauth import DiscordOAuth
+from email_service import email_service
+from ai_shopping_parser import shopping_parser, ParsedItem
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from middleware.body_limit import MaxBodySizeMiddleware
+import asyncio
+import json
+from collections import OrderedDict
+from itertools import islice
+from typing import Optional
+import logging
 import os
+import re
 import hashlib
 import time
+import datetime
+import subprocess
+from sqlalchemy import text
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+try:
+    import orjson as _json  # Serializes straight to bytes
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    _json = json
+    from fastapi.responses import JSONResponse as DefaultResponse
 
 # Import route modules
 from routes.auth import router as auth_router
@@ -20,54 +47,163 @@ from routes.locations import router as locations_router
 from routes.items import router as items_router
 from routes.users import router as users_router
 
-app = FastAPI(title="Freezer App API", version="1.0.0")
+app = FastAPI(title="Freezer App API", version="1.0.0", default_response_class=DefaultResponse)
+
+logger = logging.getLogger(__name__)
 
 # Rate limiting setup - protect against API cost spirals
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True,  # Keep limiting per worker if Redis is unreachable
+)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-# Simple in-memory cache for AI requests (prevents duplicate API calls)
-ai_cache = {}
+# AI request cache (prevents duplicate API calls) - shared across workers via Redis
+# when REDIS_URL is set, otherwise a per-process value-aware LRU (least recently used first).
+# Entries are [parsed_items, cached_time, recompute_cost, hits].
+ai_cache = OrderedDict()
 CACHE_TTL = 300  # 5 minutes cache
+AI_CACHE_SIZE = 100  # Keep cache size reasonable
+AI_CACHE_EVICTION_WINDOW = 10  # Least recently used entries considered per eviction
+ai_redis = redis_asyncio.from_url(REDIS_URL) if REDIS_URL and redis_asyncio else None
+
+
+async def _ai_cache_get(cache_key: str, current_time: float):
+    """Cached parse result for cache_key, or None on miss/expiry"""
+    if ai_redis is not None:
+        try:
+            cached = await ai_redis.get(cache_key)
+        except Exception as e:
+            logger.warning(f"AI cache read failed: {e}")
+            return None
+        if cached is None:
+            return None
+        return [ParsedItem(**item) for item in json.loads(cached)]
+    
+    if cache_key in ai_cache:
+        entry = ai_cache[cache_key]
+        cached_result, cached_time = entry[0], entry[1]
+        if current_time - cached_time < CACHE_TTL:
+            entry[3] += 1
+            ai_cache.move_to_end(cache_key)
+            return cached_result
+        # Cache expired, remove entry
+        del ai_cache[cache_key]
+    return None
+
+
+def _ai_recompute_cost(parsed_items, content_length: int) -> float:
+    """What a miss would waste: longer content parsed with higher confidence costs more to redo"""
+    if not parsed_items:
+        return 0.0
+    average_confidence = sum(item.confidence for item in parsed_items) / len(parsed_items)
+    return content_length * average_confidence
+
+
+def _ai_cache_evict(current_time: float):
+    """Drop the cheapest-to-recompute entry among the least recently used few"""
+    def value(pair):
+        _, (_, cached_time, recompute_cost, hits) = pair
+        if current_time - cached_time >= CACHE_TTL:
+            return -1.0  # Already expired - worthless
+        # Recompute cost scaled by demand (v-LRU): each hit is another miss this entry saved
+        return recompute_cost * (1 + hits)
+    
+    victim, _ = min(islice(ai_cache.items(), AI_CACHE_EVICTION_WINDOW), key=value)
+    del ai_cache[victim]
+
+
+async def _ai_cache_set(cache_key: str, parsed_items, current_time: float, content_length: int = 0):
+    if ai_redis is not None:
+        # Redis expires the key itself - no eviction pass needed
+        try:
+            await ai_redis.set(cache_key, json.dumps([item.model_dump() for item in parsed_items]), ex=CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"AI cache write failed: {e}")
+        return
+    
+    ai_cache[cache_key] = [parsed_items, current_time, _ai_recompute_cost(parsed_items, content_length), 0]
+    ai_cache.move_to_end(cache_key)
+    
+    # PROTECTION 3: Cache cleanup (prevent memory growth) - bounded scan of the LRU tail, no full sort
+    while len(ai_cache) > AI_CACHE_SIZE:
+        _ai_cache_evict(current_time)
 
 security = HTTPBearer()
 
+# Cap raw request bodies - the largest legitimate payload is a 5000-char shopping list;
+# added before CORS so 413 responses still carry CORS headers
+MAX_REQUEST_BODY_BYTES = 64 * 1024
+app.add_middleware(MaxBodySizeMiddleware, max_body_size=MAX_REQUEST_BODY_BYTES)
+
 # CORS Configuration - Environment-based for production deployment
-allowed_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+allowed_origins = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+    if origin.strip()
+)
+# Exact origins are checked with one precompiled fullmatch per request; "*" keeps Starlette's allow-all path
+if "*" in allowed_origins:
+    cors_origin_options = {"allow_origins": ["*"]}
+else:
+    cors_origin_options = {"allow_origin_regex": "|".join(re.escape(origin) for origin in allowed_origins)}
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allowed_origins,
+    **cors_origin_options,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-models.Base.metadata.create_all(bind=database.engine)
-
 # Include routers
-app.include_router(auth_router)
-app.include_router(households_router)
-app.include_router(locations_router)
-app.include_router(items_router)
-app.include_router(users_router)
+ROUTERS = (auth_router, households_router, locations_router, items_router, users_router)
+for router in ROUTERS:
+    app.include_router(router)
+
+@app.on_event("startup")
+def create_tables():
+    # docker-entrypoint.sh creates the tables once before the workers start;
+    # other launches (e.g. uvicorn --reload in development) still create them here
+    if os.getenv("DB_TABLES_READY") != "1":
+        models.Base.metadata.create_all(bind=database.engine)
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await DiscordOAuth.aclose()
+
+@app.on_event("shutdown")
+async def close_redis():
+    if ai_redis is not None:
+        await ai_redis.aclose()
+
+@app.on_event("shutdown")
+def close_smtp_connections():
+    email_service.close()
+
+# Static payloads serialized once at import. Each request still gets a fresh Response:
+# middleware such as CORS appends to the response's header list in place.
+_ROOT_BODY = _json.dumps({"message": "Freezer App API"})
+_LIVENESS_BODY = _json.dumps({"status": "ok", "service": "freezer-api"})
+_API_ROOT_BODY = _json.dumps({"message": "Freezer App API v1.0.0", "status": "operational"})
+
+def _static_json(body) -> Response:
+    return Response(content=body, media_type="application/json")
 
 @app.get("/")
 def root():
-    return {"message": "Freezer App API"}
+    return _static_json(_ROOT_BODY)
 
 @app.get("/liveness")
 def liveness():
     """Liveness probe that never touches DB or middleware."""
-    return {"status": "ok", "service": "freezer-api"}
+    return _static_json(_LIVENESS_BODY)
 
 @app.get("/version")
 def version_info():
     """Version endpoint to verify deployment state"""
-    import subprocess
-    import datetime
-    import os
-
     # Get git commit hash
     try:
         git_hash = subprocess.check_output(['git', 'rev-parse', 'HEAD']).decode('ascii').strip()
@@ -109,12 +245,13 @@ def version_info():
         }
     }
 
+# Reusable probe statements - built once instead of per health check
+_SELECT_1 = text("SELECT 1")
+_COUNT_USERS = text("SELECT COUNT(*) FROM users")
+
 @app.get("/health")
-def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Enhanced health check endpoint with database connectivity validation"""
-    import datetime
-    from sqlalchemy import text
-    
     health_status = {
         "status": "healthy",
         "service": "freezer-api",
@@ -128,7 +265,7 @@ def health_check(db: Session = Depends(get_db)):
     
     # Test database connectivity
     try:
-        result = db.execute(text("SELECT 1")).scalar()
+        result = (await db.execute(_SELECT_1)).scalar()
         if result == 1:
             health_status["checks"]["database"] = "healthy"
         else:
@@ -141,23 +278,20 @@ def health_check(db: Session = Depends(get_db)):
     # Set appropriate HTTP status code
     status_code = 200 if health_status["status"] == "healthy" else 503
     
-    from fastapi import Response
+    # Plain dict already has the schemas.HealthResponse shape - no model round-trip per probe
     return Response(
-        content=schemas.HealthResponse(**health_status).model_dump_json(),
+        content=_json.dumps(health_status),
         status_code=status_code,
         media_type="application/json"
     )
 
 @app.get("/api/liveness")
 def api_liveness():
-    return {"status": "ok", "service": "freezer-api"}
+    return _static_json(_LIVENESS_BODY)
 
 @app.get("/api/health")  
-def api_health_check(db: Session = Depends(get_db)):
+async def api_health_check(db: AsyncSession = Depends(get_async_db)):
     """Detailed API health endpoint for deployment monitoring"""
-    import datetime
-    from sqlalchemy import text
-    
     health_data = {
         "service": "freezer-api",
         "status": "operational", 
@@ -174,11 +308,11 @@ def api_health_check(db: Session = Depends(get_db)):
     
     # Database connectivity test
     try:
-        db.execute(text("SELECT 1")).scalar()
+        (await db.execute(_SELECT_1)).scalar()
         health_data["checks"]["database_connection"] = "healthy"
         
         # Test actual query capability
-        user_count = db.execute(text("SELECT COUNT(*) FROM users")).scalar()
+        user_count = (await db.execute(_COUNT_USERS)).scalar()
         health_data["checks"]["database_query"] = "healthy"
         health_data["stats"] = {
             "total_users": user_count,
@@ -194,9 +328,9 @@ def api_health_check(db: Session = Depends(get_db)):
     
     status_code = 200 if health_data["status"] == "operational" else 503
     
-    from fastapi import Response
+    # Plain dict already has the schemas.ApiHealthResponse shape
     return Response(
-        content=schemas.ApiHealthResponse(**health_data).model_dump_json(),
+        content=_json.dumps(health_data),
         status_code=status_code,
         media_type="application/json"
     )
@@ -204,10 +338,207 @@ def api_health_check(db: Session = Depends(get_db)):
 @app.get("/api/")
 def api_root():
     """API root endpoint"""
-    return {"message": "Freezer App API v1.0.0", "status": "operational"}
+    return _static_json(_API_ROOT_BODY)
+
+
+# Parses in progress on this worker, by cache key
+_ai_inflight = {}
+
+
+async def _parse_single_flight(cache_key: str, content: str, source_type: str, current_time: float):
+    """
+    Parse and cache content; concurrent callers with the same cache_key await the first
+    caller's Gemini request instead of issuing their own
+    """
+    inflight = _ai_inflight.get(cache_key)
+    if inflight is not None:
+        # shield: a cancelled waiter must not cancel the shared parse
+        return await asyncio.shield(inflight)
+    
+    inflight = asyncio.get_running_loop().create_future()
+    _ai_inflight[cache_key] = inflight
+    try:
+        parsed_items = await shopping_parser.parse_shopping_content_async(
+            content=content,
+            source_type=source_type
+        )
+        # Cache before leaving the in-flight table so later callers always find one or the other
+        await _ai_cache_set(cache_key, parsed_items, current_time, len(content))
+    except asyncio.CancelledError:
+        inflight.cancel()
+        raise
+    except Exception as e:
+        inflight.set_exception(e)
+        inflight.exception()  # Marks it retrieved - there may be no waiters to re-raise it
+        raise
+    else:
+        inflight.set_result(parsed_items)
+    finally:
+        _ai_inflight.pop(cache_key, None)
+    
+    return parsed_items
 
 
 # AI Shopping List Ingestion
+# Parsed category -> (location_type, display name) for auto-created locations
+_CATEGORY_LOCATION = {
+    "freezer": ("freezer", "Freezer"),
+    "fridge": ("refrigerator", "Refrigerator"),
+    "pantry": ("pantry", "Pantry"),
+}
+_DEFAULT_LOCATION = _CATEGORY_LOCATION["pantry"]
+
+
+_ITEM_NAME_MAX = models.Item.__table__.c.name.type.length
+_ITEM_UNIT_MAX = models.Item.__table__.c.unit.type.length
+
+# ItemResponse fields read straight off freshly flushed rows (added_by is shared per batch)
+_ITEM_RESPONSE_FIELDS = tuple(name for name in schemas.ItemResponse.model_fields if name != "added_by")
+_ITEM_DATETIME_FIELDS = frozenset(
+    name for name, field in schemas.ItemResponse.model_fields.items()
+    if field.annotation in (datetime.datetime, Optional[datetime.datetime])
+)
+
+
+def _item_response_row(item: models.Item, added_by: dict) -> dict:
+    """
+    JSON-ready ItemResponse dict for an item this request just created
+    Same output as ItemResponse.model_validate(item).model_dump(mode="json")
+    without re-validating values the ORM row already holds
+    """
+    row = {}
+    for name in _ITEM_RESPONSE_FIELDS:
+        value = getattr(item, name)
+        if value is not None and name in _ITEM_DATETIME_FIELDS:
+            value = value.isoformat()
+        row[name] = value
+    row["added_by"] = added_by
+    return row
+
+
+def _ingest_item_problem(parsed_item) -> Optional[str]:
+    """Why a parsed item can't be stored as an Item row, or None if it can"""
+    if len(parsed_item.name) > _ITEM_NAME_MAX:
+        return f"name longer than {_ITEM_NAME_MAX} characters"
+    if parsed_item.unit is not None and len(parsed_item.unit) > _ITEM_UNIT_MAX:
+        return f"unit longer than {_ITEM_UNIT_MAX} characters"
+    if parsed_item.quantity is None:
+        return "quantity is missing"
+    if not float(parsed_item.quantity).is_integer():
+        # Item.quantity is a whole-number count
+        return f"quantity {parsed_item.quantity} is not a whole number"
+    return None
+
+
+def _import_parsed_items(db: Session, user_id: int, validated_items, source_type):
+    """
+    Create pending items for parsed shopping entries in one batch
+    Returns (item responses, parsing_log)
+    """
+    # Get user's household
+    households = crud.get_user_households(db, user_id)
+    if not households:
+        raise HTTPException(status_code=404, detail="No households found")
+    
+    household = households[0]  # Use first household
+    
+    # One query for the household's locations; matched in Python with the same
+    # case-insensitive substring rule as crud.get_location_by_name
+    locations = crud.get_household_locations(db, household.id)
+    locations_by_type = {}
+    
+    def find_location(location_name: str):
+        if location_name not in locations_by_type:
+            locations_by_type[location_name] = next(
+                (location for location in locations if location_name in location.name.lower()),
+                None
+            )
+        return locations_by_type[location_name]
+    
+    # Create items with ai-generated tag
+    pending = []
+    parsing_log = []
+    new_locations = []
+    
+    # Same for every item in the batch
+    source_tag = f"source-{source_type}" if source_type else None
+    description = f"Auto-imported from {source_type or 'shopping list'}"
+    
+    for parsed_item in validated_items:
+        # Rejected up front instead of raised, so the batch flush below can't fail part-way
+        problem = _ingest_item_problem(parsed_item)
+        if problem:
+            parsing_log.append({
+                "error": problem,
+                "parsed_name": parsed_item.name,
+                "skipped": True
+            })
+            continue
+        
+        # Find or create appropriate location
+        location_name, location_title = _CATEGORY_LOCATION.get(parsed_item.category, _DEFAULT_LOCATION)
+        
+        location = find_location(location_name)
+        if not location:
+            # Create location if it doesn't exist (inserted with the items below)
+            location = models.Location(
+                name=location_title,
+                location_type=location_name,
+                household_id=household.id
+            )
+            locations.append(location)
+            locations_by_type[location_name] = location
+            new_locations.append(location)
+        
+        # Create item with AI-generated tags
+        tags = ["ai-generated", f"confidence-{int(parsed_item.confidence * 100)}"]
+        if source_tag:
+            tags.append(source_tag)
+        
+        item = models.Item(
+            name=parsed_item.name,
+            quantity=int(parsed_item.quantity),
+            unit=parsed_item.unit,
+            tags=tags,
+            description=description,
+            added_by_user_id=user_id
+        )
+        item.location = location
+        
+        # Log parsing details (item_id filled in once the batch is flushed)
+        log_entry = {
+            "item_id": None,
+            "parsed_name": parsed_item.name,
+            "confidence": parsed_item.confidence,
+            "category": parsed_item.category,
+            "raw_text": parsed_item.raw_text
+        }
+        parsing_log.append(log_entry)
+        pending.append((log_entry, item))
+    
+    if not pending:
+        return [], parsing_log
+    
+    # Single flush: new locations then all items as one multi-row INSERT
+    db.add_all(new_locations)
+    db.add_all([item for _, item in pending])
+    db.flush()
+    
+    # Every item was added by the same user - serialize the profile once (identity-map hit)
+    added_by = schemas.UserProfile.model_validate(db.get(models.User, user_id)).model_dump(mode="json")
+    
+    created_items = []
+    for log_entry, item in pending:
+        log_entry["item_id"] = item.id
+        # JSON-ready dicts: the response is rendered without another jsonable_encoder pass
+        created_items.append(_item_response_row(item, added_by))
+    
+    # Responses are built before commit so expired attributes aren't reloaded row by row
+    db.commit()
+    
+    return created_items, parsing_log
+
+
 @app.post("/api/ingest-shopping")
 @limiter.limit("5/minute")  # Strict rate limit - max 5 AI requests per minute per IP
 async def ingest_shopping_list(
@@ -220,8 +551,6 @@ async def ingest_shopping_list(
     Parse shopping list/email content using AI and create pending items
     COST SPIRAL PROTECTION: Rate limited, cached, and size validated
     """
-    from ai_shopping_parser import shopping_parser
-    
     # PROTECTION 1: Input size validation (prevent massive API calls)
     if len(request.content) > 5000:  # Reasonable limit for shopping lists
         raise HTTPException(
@@ -236,41 +565,27 @@ async def ingest_shopping_list(
         )
     
     # PROTECTION 2: Content caching (prevent duplicate API calls)
-    content_hash = hashlib.md5(f"{request.content}{request.source_type}".encode()).hexdigest()
-    cache_key = f"ai_parse_{content_hash}"
+    # Non-cryptographic use: OpenSSL's sha256 runs on SHA-NI where available (faster than MD5/blake2b),
+    # and each part is hashed without building a joined copy
+    content_hash = hashlib.sha256(request.content.encode())
+    content_hash.update(b"\0")
+    content_hash.update((request.source_type or "").encode())
+    cache_key = f"ai_parse_{content_hash.hexdigest()[:32]}"
     current_time = time.time()
     
     # Check cache first
-    if cache_key in ai_cache:
-        cached_result, cached_time = ai_cache[cache_key]
-        if current_time - cached_time < CACHE_TTL:
-            # Use cached result, no API call needed
-            parsed_items = cached_result
-        else:
-            # Cache expired, remove entry
-            del ai_cache[cache_key]
-            parsed_items = None
-    else:
-        parsed_items = None
+    parsed_items = await _ai_cache_get(cache_key, current_time)
     
     try:
         # Only make API call if not cached
         if parsed_items is None:
-            # Parse content with AI
-            parsed_items = shopping_parser.parse_shopping_content(
-                content=request.content,
-                source_type=request.source_type or "generic"
+            # Parse content with AI (identical in-flight requests share one call)
+            parsed_items = await _parse_single_flight(
+                cache_key,
+                request.content,
+                request.source_type or "generic",
+                current_time
             )
-            
-            # Cache the result
-            ai_cache[cache_key] = (parsed_items, current_time)
-            
-            # PROTECTION 3: Cache cleanup (prevent memory growth)
-            if len(ai_cache) > 100:  # Keep cache size reasonable
-                # Remove oldest entries
-                oldest_keys = sorted(ai_cache.keys(), key=lambda k: ai_cache[k][1])[:20]
-                for old_key in oldest_keys:
-                    del ai_cache[old_key]
         
         # Validate parsed items
         validated_items = shopping_parser.validate_items(parsed_items)
@@ -278,84 +593,20 @@ async def ingest_shopping_list(
         if not validated_items:
             raise HTTPException(status_code=400, detail="No valid grocery items found in content")
         
-        # Get user's household
-        households = crud.get_user_households(db, current_user.id)
-        if not households:
-            raise HTTPException(status_code=404, detail="No households found")
-        
-        household = households[0]  # Use first household
-        
-        # Create items with ai-generated tag
-        created_items = []
-        parsing_log = []
-        
-        for parsed_item in validated_items:
-            try:
-                # Find or create appropriate location
-                location_name = {
-                    "freezer": "freezer", 
-                    "fridge": "refrigerator",
-                    "pantry": "pantry"
-                }.get(parsed_item.category, "pantry")
-                
-                location = crud.get_location_by_name(db, household.id, location_name)
-                if not location:
-                    # Create location if it doesn't exist
-                    location_data = schemas.LocationCreate(
-                        name=location_name.title(),
-                        location_type=location_name,
-                        household_id=household.id
-                    )
-                    location = crud.create_location(db, location_data)
-                
-                # Create item with AI-generated tags
-                tags = ["ai-generated", f"confidence-{int(parsed_item.confidence * 100)}"]
-                if request.source_type:
-                    tags.append(f"source-{request.source_type}")
-                
-                item_data = schemas.ItemCreate(
-                    name=parsed_item.name,
-                    quantity=parsed_item.quantity,
-                    unit=parsed_item.unit,
-                    tags=tags,
-                    description=f"Auto-imported from {request.source_type or 'shopping list'}"
-                )
-                
-                item = crud.create_item(
-                    db=db, 
-                    item=item_data, 
-                    location_id=location.id, 
-                    user_id=current_user.id
-                )
-                created_items.append(item)
-                
-                # Log parsing details
-                parsing_log.append({
-                    "item_id": item.id,
-                    "parsed_name": parsed_item.name,
-                    "confidence": parsed_item.confidence,
-                    "category": parsed_item.category,
-                    "raw_text": parsed_item.raw_text
-                })
-                
-            except Exception as e:
-                # Continue with other items if one fails
-                parsing_log.append({
-                    "error": str(e),
-                    "parsed_name": parsed_item.name,
-                    "skipped": True
-                })
-                continue
+        # Sync SQLAlchemy writes run off the event loop so other requests keep being served
+        created_items, parsing_log = await asyncio.to_thread(
+            _import_parsed_items, db, current_user.id, validated_items, request.source_type
+        )
         
-        return {
+        return DefaultResponse({
             "message": f"Successfully imported {len(created_items)} items from {request.source_type or 'shopping list'}",
             "items_created": len(created_items),
             "total_parsed": len(validated_items),
-            "items": [schemas.ItemResponse.from_orm(item) for item in created_items],
+            "items": created_items,
             "parsing_log": parsing_log,
             "requires_review": True,
             "review_instructions": "Items tagged 'ai-generated' should be reviewed and confirmed or modified"
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Shopping list parsing failed: {str(e)}")
@@ -3,9 +3,11 @@ Middleware package for reusable decorators and utilities
 """
 
 from .auth import verify_location_access, verify_item_access, verify_household_access
+from .body_limit import MaxBodySizeMiddleware
 
 __all__ = [
     "verify_location_access",
     "verify_item_access", 
-    "verify_household_access"
+    "verify_household_access",
+    "MaxBodySizeMiddleware"
 ]
\ No newline at end of file
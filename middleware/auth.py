@@ -18,8 +18,8 @@ def verify_location_access(location_id: int, current_user: models.User, db: Sess
     Utility function to verify user has access to a location through household membership.
     Returns the location if access is granted, raises HTTPException otherwise.
     """
-    location = crud.get_location_by_id(db, location_id)
-    if not location or not crud.is_household_member(db, location.household_id, current_user.id):
+    location = crud.get_location_if_member(db, location_id, current_user.id)
+    if not location:
         raise HTTPException(status_code=404, detail="Location not found")
     return location
 
@@ -29,14 +29,11 @@ def verify_item_access(item_id: int, current_user: models.User, db: Session) ->
     Utility function to verify user has access to an item through household membership.
     Returns (item, location) if access is granted, raises HTTPException otherwise.
     """
-    item = crud.get_item_by_id(db, item_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    
-    location = crud.get_location_by_id(db, item.location_id)
-    if not location or not crud.is_household_member(db, location.household_id, current_user.id):
+    row = crud.get_item_if_member(db, item_id, current_user.id)
+    if not row:
         raise HTTPException(status_code=404, detail="Item not found")
     
+    item, location = row
     return item, location
 
 
@@ -45,11 +42,9 @@ def verify_household_access(household_id: int, current_user: models.User, db: Se
     Utility function to verify user is a member of the specified household.
     Returns household if access is granted, raises HTTPException otherwise.
     """
-    if not crud.is_household_member(db, household_id, current_user.id):
-        raise HTTPException(status_code=403, detail="Access denied")
-    
-    household = crud.get_household_by_id(db, household_id)
+    # A missing household has no members, so both cases answer 403 as before
+    household = crud.get_household_if_member(db, household_id, current_user.id)
     if not household:
-        raise HTTPException(status_code=404, detail="Household not found")
+        raise HTTPException(status_code=403, detail="Access denied")
     
     return household
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Table, JSON
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, DateTime, Text, Table, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -9,7 +9,10 @@ household_members = Table(
     'household_members',
     Base.metadata,
     Column('household_id', Integer, ForeignKey('households.id'), primary_key=True),
-    Column('user_id', Integer, ForeignKey('users.id'), primary_key=True)
+    Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+    # The (household_id, user_id) primary key serves household-first lookups;
+    # this one serves the "households for this user" joins
+    Index('ix_household_members_user_household', 'user_id', 'household_id')
 )
 
 class User(Base):
@@ -58,7 +61,7 @@ class Location(Base):
     temperature_range = Column(String(50), nullable=True)  # frozen, cold, room_temp
     icon = Column(String(100), nullable=True)
     color = Column(String(7), nullable=True)  # hex color code
-    household_id = Column(Integer, ForeignKey("households.id"), nullable=False)
+    household_id = Column(Integer, ForeignKey("households.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     household = relationship("Household", back_populates="locations")
@@ -80,8 +83,8 @@ class Item(Base):
     custom_expiration_days = Column(Integer, nullable=True)  # Override location-based expiration
     emoji = Column(String(10), nullable=True)  # Optional emoji override
     date_added = Column(DateTime, nullable=True)  # Date when item was added (frontend usage)
-    location_id = Column(Integer, ForeignKey("locations.id"), nullable=False)
-    added_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=False, index=True)
+    added_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -1,7 +1,8 @@
 """
 Authentication routes
 """
-from fastapi import APIRouter, HTTPException, Depends, Request
+import asyncio
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -9,21 +10,25 @@ from slowapi.util import get_remote_address
 import schemas, crud, models
 from auth import get_current_user
 from database import get_db
+from config import RATE_LIMIT_STORAGE_URI, RATE_LIMIT_STRATEGY
 from discord_oauth import DiscordOAuth
 
 # Create router for auth endpoints
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 # Rate limiting
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True,  # Keep limiting per worker if Redis is unreachable
+)
 
 @router.post("/register", response_model=schemas.UserResponse)
 @limiter.limit("3/minute")  # Prevent registration abuse
-async def register(request: Request, user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_email(db, email=user.email)
-    if db_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    return await crud.create_user(db=db, user=user)
+async def register(request: Request, user: schemas.UserCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    # Duplicate emails are rejected by the INSERT's unique constraint (400)
+    return await crud.create_user(db=db, user=user, background_tasks=background_tasks)
 
 @router.post("/login")
 @limiter.limit("10/minute")  # Prevent brute force attacks
@@ -51,7 +56,7 @@ async def discord_callback(code: str, db: Session = Depends(get_db)):
         discord_user = await DiscordOAuth.get_user_info(access_token)
         
         # Check if user already exists by Discord ID
-        existing_user = crud.get_user_by_discord_id(db, discord_user["id"])
+        existing_user = await asyncio.to_thread(crud.get_user_by_discord_id, db, discord_user["id"])
         
         if existing_user:
             # User exists, log them in
@@ -63,10 +68,10 @@ async def discord_callback(code: str, db: Session = Depends(get_db)):
                 raise HTTPException(status_code=400, detail="Discord account must have a verified email")
             
             # Check if email already exists
-            email_user = crud.get_user_by_email(db, email)
+            email_user = await asyncio.to_thread(crud.get_user_by_email, db, email)
             if email_user:
                 # Link Discord account to existing email account
-                crud.link_discord_account(db, email_user, discord_user)
+                await asyncio.to_thread(crud.link_discord_account, db, email_user, discord_user)
                 return crud.create_login_response(email_user)
             else:
                 # Create new user
@@ -90,8 +95,8 @@ def verify_email(verification: schemas.EmailVerification, db: Session = Depends(
 
 @router.post("/request-password-reset")
 @limiter.limit("5/hour")  # Prevent email spam abuse
-async def request_password_reset(request_obj: Request, request: schemas.PasswordResetRequest, db: Session = Depends(get_db)):
-    return await crud.request_password_reset(db, request.email)
+async def request_password_reset(request_obj: Request, request: schemas.PasswordResetRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    return await crud.request_password_reset(db, request.email, background_tasks)
 
 @router.post("/reset-password")
 def reset_password(reset: schemas.PasswordReset, db: Session = Depends(get_db)):
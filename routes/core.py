@@ -13,13 +13,18 @@ from sqlalchemy import text
 import schemas, crud, models
 from auth import get_current_user
 from database import get_db
-from config import get_config
+from config import get_config, RATE_LIMIT_STORAGE_URI, RATE_LIMIT_STRATEGY
 
 # Create router for core endpoints
 router = APIRouter(tags=["core"])
 
 # Rate limiting
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True,  # Keep limiting per worker if Redis is unreachable
+)
 
 # Simple in-memory cache for AI requests (prevents duplicate API calls)
 ai_cache = {}
@@ -150,11 +155,10 @@ async def ingest_shopping_list(
     try:
         # Only make API call if not cached
         if parsed_items is None:
-            # Parse content with AI
-            parsed_items = await shopping_parser.parse_shopping_content(
+            # Parse content with AI - awaits Gemini without blocking the event loop
+            parsed_items = await shopping_parser.parse_shopping_content_async(
                 content=request.content,
-                source_type=request.source_type,
-                household_context=request.household_context
+                source_type=request.source_type
             )
             
             # Cache the result to prevent duplicate API calls
@@ -1,7 +1,7 @@
 """
 Household management routes
 """
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request, Response
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -9,12 +9,18 @@ from slowapi.util import get_remote_address
 import schemas, crud, models
 from auth import get_current_user
 from database import get_db
+from config import RATE_LIMIT_STORAGE_URI, RATE_LIMIT_STRATEGY
 
 # Create router for household endpoints
 router = APIRouter(prefix="/households", tags=["households"])
 
 # Rate limiting
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True,  # Keep limiting per worker if Redis is unreachable
+)
 
 @router.post("", response_model=schemas.HouseholdResponse)
 def create_household(
@@ -37,10 +43,11 @@ async def invite_to_household(
     request: Request,
     household_id: int,
     invite: schemas.HouseholdInvite,
+    background_tasks: BackgroundTasks,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return await crud.invite_to_household(db, household_id, invite.email, current_user.id)
+    return await crud.invite_to_household(db, household_id, invite.email, current_user.id, background_tasks)
 
 @router.post("/join", response_model=schemas.HouseholdResponse)
 def join_household(
@@ -50,10 +57,11 @@ def join_household(
 ):
     return crud.join_household(db, join_request.invite_code, current_user.id)
 
-@router.delete("/{household_id}/leave")
+@router.delete("/{household_id}/leave", status_code=204, response_class=Response)
 def leave_household(
     household_id: int,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return crud.leave_household(db, household_id, current_user.id)
\ No newline at end of file
+    crud.leave_household(db, household_id, current_user.id)
+    return Response(status_code=204)
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Location management routes
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from sqlalchemy.orm import Session
 
 import schemas, crud, models
@@ -20,8 +20,8 @@ def create_location(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    household = crud.get_household_by_id(db, household_id)
-    if not household or not crud.is_household_member(db, household_id, current_user.id):
+    # Membership rows only exist for existing households, so one EXISTS covers both checks
+    if not crud.is_household_member(db, household_id, current_user.id):
         raise HTTPException(status_code=404, detail="Household not found")
     return crud.create_location(db=db, location=location, household_id=household_id)
 
@@ -56,7 +56,7 @@ def update_location(
     verify_location_access(location_id, current_user, db)
     return crud.update_location(db, location_id, location_update)
 
-@router.delete("/locations/{location_id}")
+@router.delete("/locations/{location_id}", status_code=204, response_class=Response)
 def delete_location(
     location_id: int,
     current_user: models.User = Depends(get_current_user),
@@ -64,4 +64,4 @@ def delete_location(
 ):
     verify_location_access(location_id, current_user, db)
     crud.delete_location(db, location_id)
-    return {"message": "Location deleted successfully"}
\ No newline at end of file
+    return Response(status_code=204)
\ No newline at end of file
@@ -37,7 +37,7 @@ def test_location_endpoints_with_middleware(authenticated_client: TestClient):
     
     # Test DELETE location with middleware (should work)
     response = authenticated_client.delete(f"/locations/{location_id}")
-    assert response.status_code == 200
+    assert response.status_code == 204
 
 
 def test_item_endpoints_with_middleware(authenticated_client: TestClient):
@@ -52,7 +52,7 @@ def test_middleware_dry_refactoring(authenticated_client: TestClient):
     
     # DELETE location (should work with DRY middleware)
     response = authenticated_client.delete(f"/locations/{location_id}")
-    assert response.status_code == 200
-    assert response.json()["message"] == "Location deleted successfully"
+    assert response.status_code == 204
+    assert response.content == b""
     
     print("✅ DRY middleware refactoring verified successfully!")
@@ -35,6 +35,141 @@ def test_fallback_parsing_extracts_items():
         assert item.category in ["freezer", "fridge", "pantry"]
         assert 0.0 <= item.confidence <= 1.0
 
+def test_fallback_parsing_without_food_keywords():
+    """Test content with no known food keywords short-circuits to no items"""
+    parser = ShoppingListParser()
+
+    items = parser._fallback_parse("Store receipt 2 bags - $0.10\nThank you for shopping!")
+
+    assert items == []
+
+def test_parse_many_returns_one_result_per_document():
+    """Test batch parsing preserves input order and degrades without Gemini"""
+    import asyncio
+    parser = ShoppingListParser()
+    parser.model = None
+
+    results = asyncio.run(parser.parse_many([
+        ("Chicken Breast 2 lbs", "hannaford"),
+        ("Whole Milk 1 gallon", "instacart"),
+    ]))
+
+    assert results == [[], []]
+
+def test_concurrent_identical_parses_share_one_gemini_call():
+    """Test in-flight requests for the same content are coalesced into one AI call"""
+    import asyncio
+    import main
+
+    class FakeResponse:
+        text = '[{"name": "Frozen Peas", "category": "freezer", "confidence": 0.9, "raw_text": "Frozen Peas"}]'
+
+    class FakeModel:
+        calls = 0
+
+        async def generate_content_async(self, prompt):
+            FakeModel.calls += 1
+            await asyncio.sleep(0.01)
+            return FakeResponse()
+
+    parser = ShoppingListParser()
+    parser.model = FakeModel()
+
+    async def ingest_burst():
+        original = main.shopping_parser
+        main.shopping_parser = parser
+        try:
+            return await asyncio.gather(*[
+                main._parse_single_flight("ai_parse_single_flight_test", "Frozen Peas x2", "generic", 0.0)
+                for _ in range(4)
+            ])
+        finally:
+            main.shopping_parser = original
+            main.ai_cache.pop("ai_parse_single_flight_test", None)
+
+    results = asyncio.run(ingest_burst())
+
+    assert FakeModel.calls == 1
+    assert all([item.name for item in result] == ["Frozen Peas"] for result in results)
+    assert main._ai_inflight == {}
+
+def test_cache_eviction_keeps_expensive_parse_over_cheap_ones():
+    """Test the in-process AI cache evicts the cheapest recent-tail entry, not just the oldest"""
+    import asyncio
+    import main
+
+    def parsed(confidence):
+        return [ParsedItem(name="Milk", category="fridge", confidence=confidence, raw_text="Milk")]
+
+    async def fill():
+        await main._ai_cache_set("expensive", parsed(1.0), 0.0, 4000)
+        for i in range(main.AI_CACHE_SIZE):
+            await main._ai_cache_set(f"cheap{i}", parsed(0.5), 0.0, 20)
+
+    saved = main.ai_cache.copy()
+    main.ai_cache.clear()
+    try:
+        asyncio.run(fill())
+        assert len(main.ai_cache) == main.AI_CACHE_SIZE
+        assert "expensive" in main.ai_cache
+        assert "cheap0" not in main.ai_cache
+    finally:
+        main.ai_cache.clear()
+        main.ai_cache.update(saved)
+
+def test_cache_eviction_keeps_hot_short_parse_over_cold_long_one():
+    """Test repeat hits count toward an entry's value, not just its content length"""
+    import asyncio
+    import main
+
+    items = [ParsedItem(name="Milk", category="fridge", confidence=1.0, raw_text="Milk")]
+
+    async def fill():
+        await main._ai_cache_set("hot", items, 0.0, 100)
+        for _ in range(9):
+            await main._ai_cache_get("hot", 0.0)
+        await main._ai_cache_set("cold", items, 0.0, 400)
+        for i in range(main.AI_CACHE_SIZE - 1):
+            await main._ai_cache_set(f"filler{i}", items, 0.0, 5000)
+
+    saved = main.ai_cache.copy()
+    main.ai_cache.clear()
+    try:
+        asyncio.run(fill())
+        assert "hot" in main.ai_cache
+        assert "cold" not in main.ai_cache
+    finally:
+        main.ai_cache.clear()
+        main.ai_cache.update(saved)
+
+def test_ai_response_json_extracted_from_surrounding_text():
+    """Test the item array is parsed even when Gemini wraps it in prose"""
+    parser = ShoppingListParser()
+    response_text = (
+        'Here are the items I found:\n'
+        '[{"name": "Frozen Peas", "quantity": 2, "unit": "bags", "category": "freezer", '
+        '"confidence": 0.9, "raw_text": "Frozen Peas x2"}]\n'
+        'Let me know if you need anything else [happy shopping]!'
+    )
+
+    items = parser._parse_ai_response(response_text, "Frozen Peas x2")
+
+    assert [item.name for item in items] == ["Frozen Peas"]
+    assert items[0].category == "freezer"
+
+def test_parsing_prompt_truncates_on_line_boundary():
+    """Test long content is cut at a full line rather than mid-item"""
+    parser = ShoppingListParser()
+    line = "Organic Chicken Breast 2.5 lbs @ $8.99/lb - $22.48\n"
+    content = line * 100
+
+    prompt = parser._create_parsing_prompt(content, "hannaford")
+    included = prompt.split("CONTENT TO PARSE:\n", 1)[1]
+
+    body = included.split("\nHANNAFORD SPECIFIC:")[0].rstrip("\n")
+    assert len(body) <= 2000
+    assert all(row == line.rstrip("\n") for row in body.split("\n"))
+
 def test_category_inference():
     """Test that items are categorized correctly"""
     parser = ShoppingListParser()
@@ -91,6 +226,20 @@ def test_api_schema_compatibility():
     assert request.content == "Test shopping list content"
     assert request.source_type == "hannaford"
 
+def test_oversized_request_body_rejected_before_parsing():
+    """Test the body size middleware answers 413 without reading the payload"""
+    from fastapi.testclient import TestClient
+    from main import app, MAX_REQUEST_BODY_BYTES
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/ingest-shopping",
+        content=b"x" * (MAX_REQUEST_BODY_BYTES + 1),
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 413
+
 def test_grocery_pattern_matching():
     """Test that grocery patterns are matched correctly"""
     parser = ShoppingListParser()
@@ -1,4 +1,15 @@
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+
+import auth
+import crud
+import schemas
 from utils.test_data import create_test_user_data
 
 
@@ -18,6 +29,40 @@ def test_user_registration(client: TestClient):
     assert "id" in data
 
 
+def test_duplicate_registration_rejected(client: TestClient):
+    test_user = create_test_user_data()
+    payload = {
+        "email": test_user["email"],
+        "password": test_user["password"],
+        "full_name": test_user["full_name"],
+    }
+    assert client.post("/auth/register", json=payload).status_code == 200
+
+    response = client.post("/auth/register", json=payload)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+
+    # The failed INSERT is rolled back; the original account still works
+    response = client.post(
+        "/auth/login",
+        json={"email": test_user["email"], "password": test_user["password"]},
+    )
+    assert response.status_code == 200
+
+
+def test_other_integrity_errors_are_not_reported_as_duplicates(db_session, monkeypatch):
+    test_user = create_test_user_data()
+
+    def failing_commit():
+        raise IntegrityError(
+            "INSERT INTO users", None, Exception("NOT NULL constraint failed: users.hashed_password")
+        )
+
+    monkeypatch.setattr(db_session, "commit", failing_commit)
+    with pytest.raises(IntegrityError):
+        crud._insert_user(db_session, schemas.UserCreate(**test_user), "token")
+
+
 def test_user_login(client: TestClient):
     test_user = create_test_user_data()
     client.post(
@@ -37,3 +82,21 @@ def test_user_login(client: TestClient):
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
+
+
+def test_cached_token_is_rejected_once_expired(monkeypatch):
+    token = auth.create_access_token({"sub": "cached@example.com"}, expires_delta=timedelta(minutes=5))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    assert auth.verify_token(credentials) == "cached@example.com"
+
+    # The claims are now cached; the expiry must still be enforced on later uses
+    real_time = time.time
+    monkeypatch.setattr(auth.time, "time", lambda: real_time() + 600)
+    with pytest.raises(HTTPException) as exc_info:
+        auth.verify_token(credentials)
+    assert exc_info.value.status_code == 401
+
+
+def test_malformed_token_is_unauthorized(client: TestClient):
+    response = client.get("/users/me", headers={"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
@@ -43,3 +43,60 @@ def test_get_items_in_location(authenticated_client: TestClient):
     items = response.json()
     assert len(items) == 1
     assert items[0]["name"] == "Popsicles"
+
+
+def test_ingest_shopping_creates_items_in_one_batch(authenticated_client: TestClient, monkeypatch):
+    from ai_shopping_parser import shopping_parser
+
+    class FakeResponse:
+        text = (
+            '[{"name": "Frozen Peas", "quantity": 2, "unit": "bags", "category": "freezer", '
+            '"confidence": 0.9, "raw_text": "Frozen Peas x2"}, '
+            '{"name": "Whole Milk", "quantity": 1, "unit": "gallon", "category": "fridge", '
+            '"confidence": 0.8, "raw_text": "Whole Milk"}, '
+            '{"name": "Ground Beef", "quantity": 1.5, "unit": "lbs", "category": "freezer", '
+            '"confidence": 0.8, "raw_text": "Ground Beef 1.5 lbs"}, '
+            '{"name": "Bananas", "quantity": null, "unit": null, "category": "pantry", '
+            '"confidence": 0.7, "raw_text": "Bananas"}]'
+        )
+
+    class FakeModel:
+        async def generate_content_async(self, prompt):
+            return FakeResponse()
+
+    monkeypatch.setattr(shopping_parser, "model", FakeModel())
+    household_response = authenticated_client.post(
+        "/households", json={"name": "Test House"}
+    )
+    household_id = household_response.json()["id"]
+
+    response = authenticated_client.post(
+        "/api/ingest-shopping",
+        json={"content": "Frozen Peas x2\nWhole Milk\nGround Beef 1.5 lbs\nBananas", "source_type": "instacart"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items_created"] == 2
+    stored = [entry for entry in data["parsing_log"] if not entry.get("skipped")]
+    assert [entry["item_id"] for entry in stored] == [item["id"] for item in data["items"]]
+    assert data["parsing_log"][2]["skipped"] and data["parsing_log"][2]["parsed_name"] == "Ground Beef"
+    assert data["parsing_log"][3]["skipped"] and data["parsing_log"][3]["parsed_name"] == "Bananas"
+
+    locations = authenticated_client.get(f"/households/{household_id}/locations").json()
+    freezer = next(loc for loc in locations if loc["name"] == "Freezer")
+    assert data["items"][0]["location_id"] == freezer["id"]
+    assert "source-instacart" in data["items"][0]["tags"]
+
+    by_id = lambda item: item["id"]
+    listed = authenticated_client.get("/items").json()
+    assert sorted(data["items"], key=by_id) == sorted(listed, key=by_id)
+
+
+def test_ingest_shopping_rejects_bad_content_size(authenticated_client: TestClient):
+    response = authenticated_client.post("/api/ingest-shopping", json={"content": "   milk   "})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Content too short")
+
+    response = authenticated_client.post("/api/ingest-shopping", json={"content": "x" * 5001})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Content too large")
@@ -1,4 +1,5 @@
 from fastapi.testclient import TestClient
+from utils.test_data import create_test_user_data
 
 
 def test_get_household_locations(authenticated_client: TestClient):
@@ -15,3 +16,46 @@ def test_get_household_locations(authenticated_client: TestClient):
     assert "Freezer" in location_names
     assert "Fridge" in location_names
     assert "Pantry" in location_names
+
+
+def test_location_hidden_from_non_member(authenticated_client: TestClient):
+    household_response = authenticated_client.post(
+        "/households", json={"name": "Private House"}
+    )
+    household_id = household_response.json()["id"]
+    locations = authenticated_client.get(f"/households/{household_id}/locations").json()
+    location_id = locations[0]["id"]
+
+    outsider = {**create_test_user_data(), "email": "outsider@test.example.com"}
+    authenticated_client.post("/auth/register", json=outsider)
+    login_response = authenticated_client.post(
+        "/auth/login",
+        json={"email": outsider["email"], "password": outsider["password"]},
+    )
+    token = login_response.json()["access_token"]
+    authenticated_client.headers = {"Authorization": f"Bearer {token}"}
+
+    response = authenticated_client.put(
+        f"/locations/{location_id}", json={"name": "Hijacked", "location_type": "freezer"}
+    )
+    assert response.status_code == 404
+    response = authenticated_client.get(f"/locations/{location_id}/items")
+    assert response.status_code == 404
+
+
+def test_delete_location_with_items_rejected(authenticated_client: TestClient):
+    household_response = authenticated_client.post(
+        "/households", json={"name": "Test House"}
+    )
+    household_id = household_response.json()["id"]
+    locations = authenticated_client.get(f"/households/{household_id}/locations").json()
+    location_id = locations[0]["id"]
+
+    authenticated_client.post(
+        f"/locations/{location_id}/items", json={"name": "Frozen Peas", "quantity": 1}
+    )
+
+    response = authenticated_client.delete(f"/locations/{location_id}")
+    assert response.status_code == 400
+    response = authenticated_client.get(f"/locations/{location_id}/items")
+    assert len(response.json()) == 1
@@ -125,6 +125,18 @@ class TestNPlusOneOptimization:
         
         print(f"✅ get_user_locations executed with {query_count} queries (optimized)")
     
+    def test_get_user_households_single_query(self):
+        """Test that get_user_households resolves memberships in one query"""
+        global query_count
+        user_id = self.user.id
+        query_count = 0
+
+        households = crud.get_user_households(self.db, user_id)
+        household_ids = {h.id for h in households}
+
+        assert query_count == 1, f"Too many queries: {query_count}, expected 1"
+        assert household_ids == {self.household1.id, self.household2.id}
+
     def test_get_user_items_data_correctness(self):
         """Test that optimized get_user_items returns correct data"""
         items = crud.get_user_items(self.db, self.user.id)
@@ -0,0 +1,66 @@
+"""
+Cache consistency tests for the mindfulness vector search (docs/mindfulness)
+"""
+import hashlib
+import os
+import sys
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "docs", "mindfulness"))
+from vector_search import MindfulVectorSearch  # noqa: E402
+
+PARAGRAPH = "Noticing the breath while the build runs is a small practice of attention number {}."
+
+
+class FakeModel:
+    """Deterministic stand-in for SentenceTransformer - no model download"""
+    dimension = 8
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode(self, texts, **kwargs):
+        rows = []
+        for text in texts:
+            digest = hashlib.sha256(text.encode()).digest()[:self.dimension]
+            vector = np.frombuffer(digest, dtype=np.uint8).astype(np.float32) - 127.5
+            rows.append(vector / np.linalg.norm(vector))
+        return torch.from_numpy(np.stack(rows))
+
+
+def write_docs(docs_dir, count):
+    """One indexed paragraph per file"""
+    for i in range(count):
+        (docs_dir / f"journal-{i}.md").write_text(f"# Journal {i}\n\n{PARAGRAPH.format(i)}\n")
+
+
+def build(docs_dir, cache_dir, precision):
+    search = MindfulVectorSearch(docs_dir=docs_dir, cache_dir=cache_dir, precision=precision)
+    search.model = FakeModel()
+    search.ensure_index_built()
+    return search
+
+
+def test_precision_switch_after_content_change_rebuilds(tmp_path):
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    cache_dir = tmp_path / "cache"
+
+    write_docs(docs_dir, 3)
+    build(docs_dir, cache_dir, "int8")
+
+    # Content changes, then only the float32 index is rebuilt
+    write_docs(docs_dir, 5)
+    float_search = build(docs_dir, cache_dir, "float32")
+    assert float_search.document_count == 5
+
+    # The int8 cache is stale; it must not be paired with float32's documents
+    int8_search = build(docs_dir, cache_dir, "int8")
+    assert int8_search.document_count == 5
+    assert len(int8_search.embeddings) == int8_search.document_count
+    assert int8_search.embeddings.dtype == np.int8